@@ -90,7 +90,7 @@ def run_authentication_agent(state: AgentWorkforceState) -> AgentWorkforceState:
             print(f"DEBUG: Created auth_request_dict from env: {auth_request_dict}")
         else:
             print("Authentication Agent: No auth_request provided in current_auth_request and no ORG_ALIAS environment variable set.")
-            updated_state = state.copy()
+            updated_state: AgentWorkforceState = {}
             auth_response = AuthenticationResponse(
                 success=False,
                 error_message="Authentication Agent Error: No auth_request provided and no ORG_ALIAS environment variable set. Please provide an org_alias to authenticate."
@@ -111,7 +111,8 @@ def run_authentication_agent(state: AgentWorkforceState) -> AgentWorkforceState:
         # The tool's input schema is org_alias.
         auth_response: AuthenticationResponse = auth_tool.invoke({"org_alias": org_alias_to_authenticate})
 
-        updated_state = state.copy() # Start with a fresh copy of the current state
+        # Return only the changed keys; LangGraph merges them into the graph state
+        updated_state: AgentWorkforceState = {}
         
         if auth_response.success and auth_response.session_details:
             print(f"Authentication Agent: Successfully authenticated to {org_alias_to_authenticate}.")
@@ -149,7 +150,7 @@ def run_authentication_agent(state: AgentWorkforceState) -> AgentWorkforceState:
         import traceback
         print(f"DEBUG: Traceback: {traceback.format_exc()}")
         
-        updated_state = state.copy()
+        updated_state: AgentWorkforceState = {}
         auth_response = AuthenticationResponse(
             success=False,
             error_message=f"Authentication Agent Processing Error: {str(e)}"
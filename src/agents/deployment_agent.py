@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Any, Optional
 
 from langchain_core.language_models import BaseLanguageModel
 
@@ -6,6 +6,119 @@ from src.tools.salesforce_deployer_tool import SalesforceDeployerTool
 from src.schemas.deployment_schemas import DeploymentRequest, DeploymentResponse
 from src.state.agent_workforce_state import AgentWorkforceState # Updated path
 
+def _prepare_deployment(deployment_request_dict: Any, retry_count: int) -> DeploymentRequest:
+    """Coerce the state's deployment request into a model and log what will be deployed."""
+    # The orchestrator stores the request model itself; older states hold a dict
+    if isinstance(deployment_request_dict, DeploymentRequest):
+        deployment_request = deployment_request_dict
+    else:
+        deployment_request = DeploymentRequest(**deployment_request_dict)
+    
+    print(f"Processing DeploymentRequest ID: {deployment_request.request_id}")
+    
+    # Display components to be deployed with enhanced debugging
+    component_info = []
+    for i, component in enumerate(deployment_request.components):
+        component_info.append(f"{component.component_type}:{component.api_name}")
+        
+        # Show XML details for Flow components
+        if component.component_type == "Flow":
+            xml_length = len(component.metadata_xml)
+            xml_snippet = component.metadata_xml[:200].replace('\n', ' ').replace('\r', ' ')
+            
+            print(f"📄 Flow XML received by Deployment Agent:")
+            print(f"   Component #{i+1}: {component.api_name}")
+            print(f"   XML Length: {xml_length} characters")
+            print(f"   XML Preview: {xml_snippet}...")
+            
+            if retry_count > 0:
+                print(f"   🔄 This should be UPDATED XML from retry #{retry_count}")
+            else:
+                print(f"   🆕 This should be INITIAL XML")
+    
+    print(f"Components to deploy: {', '.join(component_info)}")
+    return deployment_request
+
+def _record_deployment(deployment_request: DeploymentRequest, deployment_response: DeploymentResponse,
+                       retry_count: int, response_updates: AgentWorkforceState) -> None:
+    """Log the deployment outcome and store the response in ``response_updates``."""
+    if deployment_response.success:
+        print(f"✅ Deployment successful for request ID: {deployment_request.request_id}")
+        print(f"   Salesforce Deployment ID: {deployment_response.deployment_id}")
+        print(f"   Components deployed: {deployment_response.successful_components}/{deployment_response.total_components}")
+        
+        if retry_count > 0:
+            print(f"   🎉 RETRY #{retry_count} was SUCCESSFUL!")
+        
+        if deployment_response.component_successes:
+            print("   Successfully deployed components:")
+            for success in deployment_response.component_successes:
+                print(f"     - {success.get('fullName')} ({success.get('componentType')})")
+                
+    else:
+        print(f"❌ Deployment failed for request ID: {deployment_request.request_id}")
+        print(f"   Status: {deployment_response.status}")
+        print(f"   Components failed: {deployment_response.failed_components}/{deployment_response.total_components}")
+        
+        if retry_count > 0:
+            print(f"   😞 RETRY #{retry_count} also FAILED - will analyze for next retry")
+        else:
+            print(f"   📊 INITIAL attempt FAILED - will analyze and retry")
+        
+        if deployment_response.error_message:
+            print(f"   Error: {deployment_response.error_message}")
+            
+        if deployment_response.component_errors:
+            print("   Component Errors:")
+            for error in deployment_response.component_errors:
+                component_name = error.get('fullName', 'Unknown')
+                component_type = error.get('componentType', 'Unknown')
+                problem = error.get('problem', 'Unknown error')
+                print(f"     - {component_name} ({component_type}): {problem}")
+
+    # Convert response to dict for state storage
+    response_updates["current_deployment_response"] = deployment_response.model_dump()
+    response_updates["current_deployment_request"] = None # Clear the request
+
+def _record_deployment_error(deployment_request_dict: Any, e: Exception,
+                             response_updates: AgentWorkforceState) -> None:
+    """Store a failed DeploymentResponse for an error raised outside the tool."""
+    # This is for unexpected errors in the agent/tool interaction itself,
+    # not for deployment errors which the tool should handle and return in DeploymentResponse.
+    error_message = f"DeploymentAgent: Error processing deployment: {str(e)}"
+    print(error_message)
+    
+    if isinstance(deployment_request_dict, DeploymentRequest):
+        request_id = deployment_request_dict.request_id
+        component_count = len(deployment_request_dict.components)
+    else:
+        request_id = deployment_request_dict.get("request_id", "unknown")
+        component_count = len(deployment_request_dict.get("components", []))
+    
+    # Create a DeploymentResponse indicating this internal failure
+    error_response = DeploymentResponse(
+        request_id=request_id,
+        success=False,
+        status="Failed",
+        error_message=error_message,
+        total_components=component_count,
+        successful_components=0,
+        failed_components=component_count
+    )
+    response_updates["current_deployment_response"] = error_response.model_dump()
+    response_updates["current_deployment_request"] = None # Clear the request
+
+def _start_deployment_agent(state: AgentWorkforceState) -> int:
+    print("----- DEPLOYMENT AGENT -----")
+    retry_count = state.get("build_deploy_retry_count", 0)
+    
+    # Enhanced debugging for retry tracking
+    if retry_count > 0:
+        print(f"🔄 DEPLOYMENT AGENT - Processing RETRY ATTEMPT #{retry_count}")
+    else:
+        print("🆕 DEPLOYMENT AGENT - Processing INITIAL ATTEMPT")
+    return retry_count
+
 def run_deployment_agent(state: AgentWorkforceState, llm: BaseLanguageModel) -> AgentWorkforceState:
     """
     Runs the Deployment Agent.
@@ -14,118 +127,58 @@ def run_deployment_agent(state: AgentWorkforceState, llm: BaseLanguageModel) ->
     SalesforceDeployerTool to deploy multiple metadata components to Salesforce,
     and updates the state with a DeploymentResponse.
     """
-    print("----- DEPLOYMENT AGENT -----")
+    retry_count = _start_deployment_agent(state)
     deployment_request_dict = state.get("current_deployment_request")
-    retry_count = state.get("build_deploy_retry_count", 0)
-    
-    # Enhanced debugging for retry tracking
-    if retry_count > 0:
-        print(f"🔄 DEPLOYMENT AGENT - Processing RETRY ATTEMPT #{retry_count}")
-    else:
-        print("🆕 DEPLOYMENT AGENT - Processing INITIAL ATTEMPT")
     
-    response_updates = {}
+    # Only the changed keys are returned; LangGraph merges them into the graph state
+    response_updates: AgentWorkforceState = {}
 
     if deployment_request_dict:
         try:
-            # Convert dict back to Pydantic model
-            deployment_request = DeploymentRequest(**deployment_request_dict)
-            
-            print(f"Processing DeploymentRequest ID: {deployment_request.request_id}")
-            
-            # Display components to be deployed with enhanced debugging
-            component_info = []
-            for i, component in enumerate(deployment_request.components):
-                component_info.append(f"{component.component_type}:{component.api_name}")
-                
-                # Show XML details for Flow components
-                if component.component_type == "Flow":
-                    xml_length = len(component.metadata_xml)
-                    xml_snippet = component.metadata_xml[:200].replace('\n', ' ').replace('\r', ' ')
-                    
-                    print(f"📄 Flow XML received by Deployment Agent:")
-                    print(f"   Component #{i+1}: {component.api_name}")
-                    print(f"   XML Length: {xml_length} characters")
-                    print(f"   XML Preview: {xml_snippet}...")
-                    
-                    if retry_count > 0:
-                        print(f"   🔄 This should be UPDATED XML from retry #{retry_count}")
-                    else:
-                        print(f"   🆕 This should be INITIAL XML")
-            
-            print(f"Components to deploy: {', '.join(component_info)}")
+            deployment_request = _prepare_deployment(deployment_request_dict, retry_count)
 
             tool = SalesforceDeployerTool()
             
             # Call the tool's _run method directly with the DeploymentRequest
             deployment_response: DeploymentResponse = tool._run(deployment_request)
-            
-            if deployment_response.success:
-                print(f"✅ Deployment successful for request ID: {deployment_request.request_id}")
-                print(f"   Salesforce Deployment ID: {deployment_response.deployment_id}")
-                print(f"   Components deployed: {deployment_response.successful_components}/{deployment_response.total_components}")
-                
-                if retry_count > 0:
-                    print(f"   🎉 RETRY #{retry_count} was SUCCESSFUL!")
-                
-                if deployment_response.component_successes:
-                    print("   Successfully deployed components:")
-                    for success in deployment_response.component_successes:
-                        print(f"     - {success.get('fullName')} ({success.get('componentType')})")
-                        
-            else:
-                print(f"❌ Deployment failed for request ID: {deployment_request.request_id}")
-                print(f"   Status: {deployment_response.status}")
-                print(f"   Components failed: {deployment_response.failed_components}/{deployment_response.total_components}")
-                
-                if retry_count > 0:
-                    print(f"   😞 RETRY #{retry_count} also FAILED - will analyze for next retry")
-                else:
-                    print(f"   📊 INITIAL attempt FAILED - will analyze and retry")
-                
-                if deployment_response.error_message:
-                    print(f"   Error: {deployment_response.error_message}")
-                    
-                if deployment_response.component_errors:
-                    print("   Component Errors:")
-                    for error in deployment_response.component_errors:
-                        component_name = error.get('fullName', 'Unknown')
-                        component_type = error.get('componentType', 'Unknown')
-                        problem = error.get('problem', 'Unknown error')
-                        print(f"     - {component_name} ({component_type}): {problem}")
-
-            # Convert response to dict for state storage
-            response_updates["current_deployment_response"] = deployment_response.model_dump()
-            response_updates["current_deployment_request"] = None # Clear the request
+            _record_deployment(deployment_request, deployment_response, retry_count, response_updates)
 
         except Exception as e:
-            # This catch is for unexpected errors in the agent/tool interaction itself,
-            # not for deployment errors which the tool should handle and return in DeploymentResponse.
-            error_message = f"DeploymentAgent: Error processing deployment: {str(e)}"
-            print(error_message)
-            
-            # Create a DeploymentResponse indicating this internal failure
-            error_response = DeploymentResponse(
-                request_id=deployment_request_dict.get("request_id", "unknown"),
-                success=False,
-                status="Failed",
-                error_message=error_message,
-                total_components=len(deployment_request_dict.get("components", [])),
-                successful_components=0,
-                failed_components=len(deployment_request_dict.get("components", []))
-            )
-            response_updates["current_deployment_response"] = error_response.model_dump()
-            response_updates["current_deployment_request"] = None # Clear the request
+            _record_deployment_error(deployment_request_dict, e, response_updates)
 
     else:
         print("DeploymentAgent: No current_deployment_request to process.")
 
-    # Merge updates with the current state
-    updated_state = state.copy()
-    for key, value in response_updates.items():
-        updated_state[key] = value
-        
-    return updated_state
+    return response_updates
+
+async def arun_deployment_agent(state: AgentWorkforceState, llm: BaseLanguageModel) -> AgentWorkforceState:
+    """
+    Async variant of ``run_deployment_agent``.
+
+    Uses the deployer tool's ``_arun`` so status polling waits on the event
+    loop instead of holding an executor thread for the whole deployment.
+    """
+    retry_count = _start_deployment_agent(state)
+    deployment_request_dict = state.get("current_deployment_request")
+    
+    # Only the changed keys are returned; LangGraph merges them into the graph state
+    response_updates: AgentWorkforceState = {}
+
+    if deployment_request_dict:
+        try:
+            deployment_request = _prepare_deployment(deployment_request_dict, retry_count)
+
+            tool = SalesforceDeployerTool()
+            deployment_response: DeploymentResponse = await tool._arun(deployment_request)
+            _record_deployment(deployment_request, deployment_response, retry_count, response_updates)
+
+        except Exception as e:
+            _record_deployment_error(deployment_request_dict, e, response_updates)
+
+    else:
+        print("DeploymentAgent: No current_deployment_request to process.")
+
+    return response_updates
 
 # Example Usage (Conceptual - for testing this agent node directly)
 # if __name__ == '__main__':
@@ -16,15 +16,16 @@ RAG functionality temporarily disabled:
 
 import os
 import logging
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from langchain_core.language_models import BaseLanguageModel
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.messages import HumanMessage
 import xml.etree.ElementTree as ET
 
 from ..tools.flow_builder_tools import BasicFlowXmlGeneratorTool
 from ..schemas.flow_builder_schemas import FlowBuildRequest, FlowBuildResponse
 from ..state.agent_workforce_state import AgentWorkforceState
+from ..config import build_system_message
 
 logger = logging.getLogger(__name__)
 
@@ -71,6 +72,74 @@ def _log_flow_success(flow_name: str, details: Optional[Dict[str, Any]] = None,
     
     logger.info(separator)
 
+class _FlowXmlStreamChecker:
+    """Parses Flow XML as it streams in, so malformed output is caught before the response is complete"""
+    
+    _DECLARATION = "<?xml"
+    _ROOT_END = "</Flow>"
+    
+    def __init__(self):
+        self._parser = ET.XMLPullParser(events=("end",))
+        self._preamble = ""
+        self._carry = ""
+        self._has_declaration = False
+        self.started = False
+        self.complete = False
+    
+    def feed(self, text: str) -> None:
+        """Feed the next streamed chunk; raises ET.ParseError as soon as the XML is malformed"""
+        if self.complete or not text:
+            return
+        
+        if not self.started:
+            # Skip any prose or code fence the LLM writes before the XML itself
+            self._preamble += text
+            start_idx = self._preamble.find(self._DECLARATION)
+            if start_idx == -1:
+                start_idx = self._preamble.find("<Flow")
+            if start_idx == -1:
+                return
+            text = self._preamble[start_idx:]
+            self._preamble = ""
+            self.started = True
+            self._has_declaration = text.startswith(self._DECLARATION)
+        
+        # Stop at the root's closing tag; anything after it (e.g. a closing code fence)
+        # is not XML. Hold back a short tail so a tag split across chunks is still found.
+        text = self._carry + text
+        if not self._has_declaration:
+            # A "<Flow" mentioned in prose can come before the document itself; like
+            # _extract_and_validate_xml, prefer the XML declaration once it shows up
+            decl_idx = text.find(self._DECLARATION)
+            if decl_idx != -1:
+                self._parser = ET.XMLPullParser(events=("end",))
+                self._has_declaration = True
+                text = text[decl_idx:]
+        end_idx = text.find(self._ROOT_END)
+        if end_idx != -1:
+            self._parser.feed(text[:end_idx + len(self._ROOT_END)])
+            self._parser.close()
+            self.complete = True
+            return
+        
+        keep = len(self._ROOT_END) - 1
+        self._carry = text[-keep:]
+        self._parser.feed(text[:-keep])
+        # Drain events so the parser does not accumulate them for the whole document
+        for _ in self._parser.read_events():
+            pass
+
+
+def _chunk_text(content: Any) -> str:
+    """Text of a streamed message chunk, whose content may be a string or a list of blocks"""
+    if isinstance(content, str):
+        return content
+    return "".join(
+        block.get("text", "") if isinstance(block, dict) else str(block)
+        for block in content
+    )
+
+
 class FlowBuildingMemory:
     """Custom memory system that preserves successful patterns and key improvements"""
     
@@ -1069,35 +1138,80 @@ class EnhancedFlowBuilderAgent:
     
     def generate_flow_with_rag(self, request: FlowBuildRequest) -> FlowBuildResponse:
         """Generate a flow using unified RAG-enhanced approach for both initial and retry attempts"""
+        retry_attempt = request.retry_context.get('retry_attempt', 1) if request.retry_context else 1
         
         try:
-            # Step 1: Analyze requirements
-            analysis = self.analyze_requirements(request)
-            retry_attempt = request.retry_context.get('retry_attempt', 1) if request.retry_context else 1
+            generation = self._prepare_generation(request)
             
-            # Step 2: Retrieve knowledge (enhanced for retry attempts)
-            knowledge = self.retrieve_knowledge(analysis)
+            # Stream the response so malformed XML aborts the generation early
+            checker = _FlowXmlStreamChecker()
+            parts: List[str] = []
+            for chunk in self.llm.stream(generation["messages"]):
+                text = _chunk_text(chunk.content)
+                parts.append(text)
+                self._check_streamed_xml(checker, text)
             
-            # Step 3: If this is a retry attempt, get error-specific RAG knowledge
-            error_specific_knowledge = {}
-            if request.retry_context:
-                # Extract deployment errors from retry context
-                deployment_errors = request.retry_context.get('deployment_errors', [])
-                if deployment_errors:
-                    print(f"🔍 Retrieving error-specific RAG knowledge for {len(deployment_errors)} deployment errors")
-                    error_specific_knowledge = self.retrieve_error_specific_knowledge(deployment_errors)
-                    
-                    # Log what we found
-                    if error_specific_knowledge.get('documentation_results'):
-                        print(f"📚 Found {len(error_specific_knowledge['documentation_results'])} error-specific documentation entries")
-                    else:
-                        print("⚠️  No error-specific documentation found in knowledge base")
+            return self._complete_generation(request, generation, "".join(parts), retry_attempt)
+        
+        except Exception as e:
+            return self._generation_error_response(request, e, retry_attempt)
+    
+    async def agenerate_flow_with_rag(self, request: FlowBuildRequest) -> FlowBuildResponse:
+        """Async variant of generate_flow_with_rag; awaits the LLM stream instead of blocking on it"""
+        retry_attempt = request.retry_context.get('retry_attempt', 1) if request.retry_context else 1
+        
+        try:
+            generation = self._prepare_generation(request)
             
-            # Step 4: Generate enhanced prompt with both regular and error-specific knowledge
-            enhanced_prompt = self.generate_enhanced_prompt(request, knowledge, error_specific_knowledge)
+            checker = _FlowXmlStreamChecker()
+            parts: List[str] = []
+            async for chunk in self.llm.astream(generation["messages"]):
+                text = _chunk_text(chunk.content)
+                parts.append(text)
+                self._check_streamed_xml(checker, text)
             
-            # Enhanced system prompt for XML generation
-            xml_system_prompt = """You are an expert Salesforce Flow developer. Your task is to generate complete, production-ready Salesforce Flow XML based on user requirements and context.
+            return self._complete_generation(request, generation, "".join(parts), retry_attempt)
+        
+        except Exception as e:
+            return self._generation_error_response(request, e, retry_attempt)
+    
+    @staticmethod
+    def _check_streamed_xml(checker: _FlowXmlStreamChecker, text: str) -> None:
+        """Feed a streamed chunk to the checker, failing the generation on malformed XML"""
+        try:
+            checker.feed(text)
+        except ET.ParseError as e:
+            # Raising ends the stream, so the rest of a broken response is not paid for
+            raise Exception(f"LLM produced malformed Flow XML: {e}") from e
+    
+    def _prepare_generation(self, request: FlowBuildRequest) -> Dict[str, Any]:
+        """Analyze the request, gather knowledge and build the LLM messages (steps 1-4)"""
+        # Step 1: Analyze requirements
+        analysis = self.analyze_requirements(request)
+        
+        # Step 2: Retrieve knowledge (enhanced for retry attempts)
+        knowledge = self.retrieve_knowledge(analysis)
+        
+        # Step 3: If this is a retry attempt, get error-specific RAG knowledge
+        error_specific_knowledge = {}
+        if request.retry_context:
+            # Extract deployment errors from retry context
+            deployment_errors = request.retry_context.get('deployment_errors', [])
+            if deployment_errors:
+                print(f"🔍 Retrieving error-specific RAG knowledge for {len(deployment_errors)} deployment errors")
+                error_specific_knowledge = self.retrieve_error_specific_knowledge(deployment_errors)
+                
+                # Log what we found
+                if error_specific_knowledge.get('documentation_results'):
+                    print(f"📚 Found {len(error_specific_knowledge['documentation_results'])} error-specific documentation entries")
+                else:
+                    print("⚠️  No error-specific documentation found in knowledge base")
+        
+        # Step 4: Generate enhanced prompt with both regular and error-specific knowledge
+        enhanced_prompt = self.generate_enhanced_prompt(request, knowledge, error_specific_knowledge)
+        
+        # Enhanced system prompt for XML generation
+        xml_system_prompt = """You are an expert Salesforce Flow developer. Your task is to generate complete, production-ready Salesforce Flow XML based on user requirements and context.
 
 CRITICAL INSTRUCTIONS:
 1. Always respond with ONLY the Flow XML - no explanations, markdown, comments or other text
@@ -1194,113 +1308,127 @@ RAG-ENHANCED ERROR RESOLUTION:
 - Follow the troubleshooting patterns for similar error scenarios
 - Always verify that Flow Rules are followed in the solution"""
 
-            messages = [
-                SystemMessage(content=xml_system_prompt),
-                HumanMessage(content=enhanced_prompt)
+        # The system prompt is identical on every build and retry, so let the
+        # provider cache it; only the request-specific human message changes
+        messages = [
+            build_system_message(self.llm, xml_system_prompt),
+            HumanMessage(content=enhanced_prompt)
+        ]
+        
+        return {
+            "analysis": analysis,
+            "knowledge": knowledge,
+            "error_specific_knowledge": error_specific_knowledge,
+            "messages": messages
+        }
+    
+    def _complete_generation(self, request: FlowBuildRequest, generation: Dict[str, Any],
+                             llm_content: str, retry_attempt: int) -> FlowBuildResponse:
+        """Turn the LLM output into a FlowBuildResponse and record the attempt (step 5)"""
+        analysis = generation["analysis"]
+        knowledge = generation["knowledge"]
+        error_specific_knowledge = generation["error_specific_knowledge"]
+        
+        # Step 5: Extract and validate XML from LLM response
+        flow_xml = self._extract_and_validate_xml(llm_content, request)
+        
+        if flow_xml:
+            # Generate flow definition XML
+            flow_definition_xml = self._generate_flow_definition_xml(request)
+            
+            # Analyze what was created (best effort from XML)
+            elements_created = self._analyze_elements_from_xml(flow_xml)
+            variables_created = self._analyze_variables_from_xml(flow_xml)
+            
+            # Enhanced insights from RAG
+            enhanced_recommendations = [
+                f"Applied best practices for {analysis['primary_use_case']} flows",
+                f"Considered {len(knowledge['sample_flows'])} similar sample flows",
+                f"Incorporated {len(knowledge['best_practices'])} relevant best practices",
+                "Flow designed with performance and scalability in mind"
             ]
             
-            # Invoke LLM with sufficient token limit for complete Flow XML
-            llm_response = self.llm.invoke(messages)
-            
-            # Step 5: Extract and validate XML from LLM response
-            flow_xml = self._extract_and_validate_xml(llm_response.content, request)
+            enhanced_best_practices = [
+                f"RAG-enhanced flow for {analysis['complexity_level']} complexity",
+                f"Knowledge-based design for {analysis['primary_use_case']} use case",
+                "LLM-generated XML with structured error learning"
+            ]
             
-            if flow_xml:
-                # Generate flow definition XML
-                flow_definition_xml = self._generate_flow_definition_xml(request)
-                
-                # Analyze what was created (best effort from XML)
-                elements_created = self._analyze_elements_from_xml(flow_xml)
-                variables_created = self._analyze_variables_from_xml(flow_xml)
-                
-                # Enhanced insights from RAG
-                enhanced_recommendations = [
-                    f"Applied best practices for {analysis['primary_use_case']} flows",
-                    f"Considered {len(knowledge['sample_flows'])} similar sample flows",
-                    f"Incorporated {len(knowledge['best_practices'])} relevant best practices",
-                    "Flow designed with performance and scalability in mind"
-                ]
-                
-                enhanced_best_practices = [
-                    f"RAG-enhanced flow for {analysis['complexity_level']} complexity",
-                    f"Knowledge-based design for {analysis['primary_use_case']} use case",
-                    "LLM-generated XML with structured error learning"
-                ]
-                
-                if request.retry_context:
-                    enhanced_recommendations.append(f"Addressed deployment errors from retry #{retry_attempt}")
-                    enhanced_best_practices.append("Applied failure learning and memory context")
-                    
-                    # Add error-specific RAG insights
-                    if error_specific_knowledge.get('documentation_results'):
-                        error_doc_count = len(error_specific_knowledge['documentation_results'])
-                        enhanced_recommendations.append(f"Applied {error_doc_count} error-specific solutions from knowledge base")
-                        enhanced_best_practices.append("RAG-enhanced error resolution from documentation")
-                
-                enhanced_response = FlowBuildResponse(
-                    success=True,
-                    input_request=request,
-                    flow_xml=flow_xml,
-                    flow_definition_xml=flow_definition_xml,
-                    validation_errors=[],
-                    elements_created=elements_created,
-                    variables_created=variables_created,
-                    best_practices_applied=enhanced_best_practices,
-                    recommendations=enhanced_recommendations,
-                    deployment_notes="Flow generated using LLM with enhanced context and failure learning",
-                    dependencies=[]
-                )
-                
-                # Save attempt to memory as "pending validation" - real success depends on validation
-                self._save_attempt_to_memory(request.flow_api_name, request, enhanced_response, retry_attempt, validation_passed=False)  # Mark as failed until validation confirms success
-                
-                # Use structured success logging
-                _log_flow_success(
-                    flow_name=request.flow_api_name,
-                    details={
-                        "elements_created": elements_created,
-                        "variables_created": variables_created,
-                        "best_practices": enhanced_best_practices,
-                        "xml_length": len(flow_xml),
-                        "use_case": analysis['primary_use_case'],
-                        "complexity": analysis['complexity_level'],
-                        "error_specific_rag_applied": bool(error_specific_knowledge.get('documentation_results'))
-                    },
-                    retry_attempt=retry_attempt
-                )
-                
-                return enhanced_response
-            else:
-                raise Exception("Failed to extract valid XML from LLM response")
+            if request.retry_context:
+                enhanced_recommendations.append(f"Addressed deployment errors from retry #{retry_attempt}")
+                enhanced_best_practices.append("Applied failure learning and memory context")
                 
-        except Exception as e:
-            error_message = f"Enhanced FlowBuilderAgent error: {str(e)}"
+                # Add error-specific RAG insights
+                if error_specific_knowledge.get('documentation_results'):
+                    error_doc_count = len(error_specific_knowledge['documentation_results'])
+                    enhanced_recommendations.append(f"Applied {error_doc_count} error-specific solutions from knowledge base")
+                    enhanced_best_practices.append("RAG-enhanced error resolution from documentation")
+            
+            enhanced_response = FlowBuildResponse(
+                success=True,
+                input_request=request,
+                flow_xml=flow_xml,
+                flow_definition_xml=flow_definition_xml,
+                validation_errors=[],
+                elements_created=elements_created,
+                variables_created=variables_created,
+                best_practices_applied=enhanced_best_practices,
+                recommendations=enhanced_recommendations,
+                deployment_notes="Flow generated using LLM with enhanced context and failure learning",
+                dependencies=[]
+            )
+            
+            # Save attempt to memory as "pending validation" - real success depends on validation
+            self._save_attempt_to_memory(request.flow_api_name, request, enhanced_response, retry_attempt, validation_passed=False)  # Mark as failed until validation confirms success
             
-            # Use structured error logging
-            _log_flow_error(
-                error_type="Flow Generation Error",
+            # Use structured success logging
+            _log_flow_success(
                 flow_name=request.flow_api_name,
-                error_message=str(e),
                 details={
-                    "flow_description": request.flow_description,
-                    "retry_context": "Yes" if request.retry_context else "No",
-                    "user_story": request.user_story.title if request.user_story else "None",
-                    "exception_type": type(e).__name__
+                    "elements_created": elements_created,
+                    "variables_created": variables_created,
+                    "best_practices": enhanced_best_practices,
+                    "xml_length": len(flow_xml),
+                    "use_case": analysis['primary_use_case'],
+                    "complexity": analysis['complexity_level'],
+                    "error_specific_rag_applied": bool(error_specific_knowledge.get('documentation_results'))
                 },
                 retry_attempt=retry_attempt
             )
             
-            error_response = FlowBuildResponse(
-                success=False,
-                input_request=request,
-                error_message=error_message
-            )
-            
-            # Save failed attempt to memory
-            self._save_attempt_to_memory(request.flow_api_name, request, error_response, retry_attempt)
-            
-            return error_response
+            return enhanced_response
+        else:
+            raise Exception("Failed to extract valid XML from LLM response")
     
+    def _generation_error_response(self, request: FlowBuildRequest, e: Exception, retry_attempt: int) -> FlowBuildResponse:
+        """Build and record the response for a failed generation attempt"""
+        error_message = f"Enhanced FlowBuilderAgent error: {str(e)}"
+        
+        # Use structured error logging
+        _log_flow_error(
+            error_type="Flow Generation Error",
+            flow_name=request.flow_api_name,
+            error_message=str(e),
+            details={
+                "flow_description": request.flow_description,
+                "retry_context": "Yes" if request.retry_context else "No",
+                "user_story": request.user_story.title if request.user_story else "None",
+                "exception_type": type(e).__name__
+            },
+            retry_attempt=retry_attempt
+        )
+        
+        error_response = FlowBuildResponse(
+            success=False,
+            input_request=request,
+            error_message=error_message
+        )
+        
+        # Save failed attempt to memory
+        self._save_attempt_to_memory(request.flow_api_name, request, error_response, retry_attempt)
+        
+        return error_response
+
     def _extract_and_validate_xml(self, llm_content: str, request: FlowBuildRequest) -> Optional[str]:
         """Extract and validate XML from LLM response with improved parsing"""
         try:
@@ -1718,6 +1846,126 @@ RAG-ENHANCED ERROR RESOLUTION:
             logger.warning(f"Failed to update memory with validation result: {str(e)}")
 
 
+def _prepare_flow_build(state: AgentWorkforceState, llm: BaseLanguageModel,
+                        flow_build_request_dict: Dict[str, Any]) -> Tuple[EnhancedFlowBuilderAgent, FlowBuildRequest]:
+    """Rebuild the request from state and set up an agent with the persisted memory"""
+    build_deploy_retry_count = state.get("build_deploy_retry_count", 0)
+    
+    # Convert dict back to Pydantic model
+    flow_build_request = FlowBuildRequest(**flow_build_request_dict)
+    
+    print(f"Processing FlowBuildRequest for Flow: {flow_build_request.flow_api_name}")
+    print(f"Flow Description: {flow_build_request.flow_description}")
+    print(f"Build/Deploy retry count: {build_deploy_retry_count}")
+    
+    # Check for retry context and log accordingly
+    if flow_build_request.retry_context:
+        retry_attempt = flow_build_request.retry_context.get('retry_attempt', 1)
+        print(f"🔄 RETRY MODE: Processing attempt #{retry_attempt}")
+        print(f"🧠 MEMORY: Will include context from previous attempts")
+        print(f"🔧 Will rebuild flow addressing previous deployment failure")
+        print(f"🎯 Using unified approach with integrated failure context and memory (RAG disabled)")
+        
+        # Show specific fixes that will be applied
+        specific_fixes = flow_build_request.retry_context.get('specific_fixes_needed', [])
+        if specific_fixes:
+            print(f"🛠️  RETRY FIXES to apply in this attempt:")
+            for i, fix in enumerate(specific_fixes[:5], 1):  # Show first 5 fixes
+                print(f"      {i}. {fix}")
+            if len(specific_fixes) > 5:
+                print(f"      ... and {len(specific_fixes) - 5} more fixes")
+        
+        # Show deployment error being addressed
+        deployment_error = flow_build_request.retry_context.get('deployment_error', '')
+        if deployment_error:
+            truncated_error = deployment_error[:150] + "..." if len(deployment_error) > 150 else deployment_error
+            print(f"📋 ADDRESSING DEPLOYMENT ERROR: {truncated_error}")
+        
+    else:
+        print("📝 INITIAL ATTEMPT: Using unified approach (RAG disabled)")
+        print("🧠 MEMORY: Starting fresh memory tracking for this flow")
+    
+    # Load persisted memory data from state
+    persisted_memory_data = state.get("flow_builder_memory_data", {})
+    
+    # Initialize the enhanced agent with persistent memory
+    agent = EnhancedFlowBuilderAgent(llm, persisted_memory_data)
+    
+    # Check if we have memory context for this flow
+    memory_context = agent._get_memory_context(flow_build_request.flow_api_name)
+    if memory_context and "No previous attempts found" not in memory_context:
+        print("🧠 MEMORY: Found previous attempt context - using it for retry")
+        print(f"🔍 MEMORY: Previous attempts will inform this retry attempt")
+    else:
+        print("🧠 MEMORY: No previous attempts found for this flow")
+    
+    return agent, flow_build_request
+
+
+def _record_flow_build(agent: EnhancedFlowBuilderAgent, flow_build_request: FlowBuildRequest,
+                       flow_response: FlowBuildResponse, response_updates: Dict[str, Any]) -> None:
+    """Log the build outcome and collect the memory and response updates for state"""
+    # Enhanced debugging for the generated Flow XML
+    if flow_response.success and flow_response.flow_xml:
+        xml_length = len(flow_response.flow_xml)
+        xml_snippet = flow_response.flow_xml[:200].replace('\n', ' ').replace('\r', ' ')
+        
+        print(f"📄 GENERATED FLOW XML:")
+        print(f"   XML Length: {xml_length} characters")
+        print(f"   XML Preview: {xml_snippet}...")
+        
+        if flow_build_request.retry_context:
+            retry_attempt = flow_build_request.retry_context.get('retry_attempt', 1)
+            print(f"   🔄 This is UPDATED XML for retry #{retry_attempt}")
+            print(f"   🛠️  Applied fixes to address deployment failure")
+            
+            # Show what elements were created/modified
+            if flow_response.elements_created:
+                print(f"   🧱 Elements created: {', '.join(flow_response.elements_created)}")
+            if flow_response.variables_created:
+                print(f"   📊 Variables created: {', '.join(flow_response.variables_created)}")
+        else:
+            print(f"   🆕 This is INITIAL XML for first attempt")
+            
+    # Save updated memory data back to state for persistence
+    updated_memory_data = agent.get_memory_data_for_persistence()
+    response_updates["flow_builder_memory_data"] = updated_memory_data
+    print(f"🧠 MEMORY: Persisted memory data for {len(updated_memory_data)} flows")
+    
+    # Convert response to dict for state storage
+    response_updates["current_flow_build_response"] = flow_response.model_dump()
+    
+    if flow_response.success:
+        print(f"✅ Flow building successful for: {flow_build_request.flow_api_name}")
+        print(f"🧠 MEMORY: Saved successful attempt to memory")
+        if flow_build_request.retry_context:
+            retry_attempt = flow_build_request.retry_context.get('retry_attempt', 1)
+            print(f"   🎯 Successfully rebuilt flow addressing deployment issues (retry #{retry_attempt})")
+            print(f"   🔄 Maintained business requirements while fixing deployment errors")
+            print(f"   🧠 Incorporated insights from previous attempts")
+            print(f"   ➡️  This UPDATED XML will now go to deployment agent")
+        else:
+            print(f"   📋 Successfully built flow meeting user story requirements")
+            print(f"   ➡️  This INITIAL XML will now go to deployment agent")
+    else:
+        print(f"❌ Flow building failed: {flow_response.error_message}")
+        print(f"🧠 MEMORY: Saved failed attempt to memory for future learning")
+
+
+def _record_flow_build_error(flow_build_request_dict: Dict[str, Any], e: Exception,
+                             response_updates: Dict[str, Any]) -> None:
+    """Collect an error response for a build that raised"""
+    error_message = f"Enhanced FlowBuilderAgent error: {str(e)}"
+    print(error_message)
+    
+    error_response = FlowBuildResponse(
+        success=False,
+        input_request=FlowBuildRequest(**flow_build_request_dict),
+        error_message=error_message
+    )
+    response_updates["current_flow_build_response"] = error_response.model_dump()
+
+
 def run_enhanced_flow_builder_agent(state: AgentWorkforceState, llm: BaseLanguageModel) -> AgentWorkforceState:
     """
     Run the Enhanced Flow Builder Agent with unified approach and conversational memory (RAG currently disabled)
@@ -1725,128 +1973,49 @@ def run_enhanced_flow_builder_agent(state: AgentWorkforceState, llm: BaseLanguag
     print("----- ENHANCED FLOW BUILDER AGENT (with Memory, RAG disabled) -----")
     
     flow_build_request_dict = state.get("current_flow_build_request")
-    build_deploy_retry_count = state.get("build_deploy_retry_count", 0)
-    response_updates = {}
+    # Only the changed keys are returned; LangGraph merges them into the graph state
+    response_updates: AgentWorkforceState = {}
     
     if flow_build_request_dict:
         try:
-            # Convert dict back to Pydantic model
-            flow_build_request = FlowBuildRequest(**flow_build_request_dict)
-            
-            print(f"Processing FlowBuildRequest for Flow: {flow_build_request.flow_api_name}")
-            print(f"Flow Description: {flow_build_request.flow_description}")
-            print(f"Build/Deploy retry count: {build_deploy_retry_count}")
-            
-            # Check for retry context and log accordingly
-            if flow_build_request.retry_context:
-                retry_attempt = flow_build_request.retry_context.get('retry_attempt', 1)
-                print(f"🔄 RETRY MODE: Processing attempt #{retry_attempt}")
-                print(f"🧠 MEMORY: Will include context from previous attempts")
-                print(f"🔧 Will rebuild flow addressing previous deployment failure")
-                print(f"🎯 Using unified approach with integrated failure context and memory (RAG disabled)")
-                
-                # Show specific fixes that will be applied
-                specific_fixes = flow_build_request.retry_context.get('specific_fixes_needed', [])
-                if specific_fixes:
-                    print(f"🛠️  RETRY FIXES to apply in this attempt:")
-                    for i, fix in enumerate(specific_fixes[:5], 1):  # Show first 5 fixes
-                        print(f"      {i}. {fix}")
-                    if len(specific_fixes) > 5:
-                        print(f"      ... and {len(specific_fixes) - 5} more fixes")
-                
-                # Show deployment error being addressed
-                deployment_error = flow_build_request.retry_context.get('deployment_error', '')
-                if deployment_error:
-                    truncated_error = deployment_error[:150] + "..." if len(deployment_error) > 150 else deployment_error
-                    print(f"📋 ADDRESSING DEPLOYMENT ERROR: {truncated_error}")
-                
-            else:
-                print("📝 INITIAL ATTEMPT: Using unified approach (RAG disabled)")
-                print("🧠 MEMORY: Starting fresh memory tracking for this flow")
-            
-            # Load persisted memory data from state
-            persisted_memory_data = state.get("flow_builder_memory_data", {})
-            
-            # Initialize the enhanced agent with persistent memory
-            agent = EnhancedFlowBuilderAgent(llm, persisted_memory_data)
-            
-            # Check if we have memory context for this flow
-            memory_context = agent._get_memory_context(flow_build_request.flow_api_name)
-            if memory_context and "No previous attempts found" not in memory_context:
-                print("🧠 MEMORY: Found previous attempt context - using it for retry")
-                print(f"🔍 MEMORY: Previous attempts will inform this retry attempt")
-            else:
-                print("🧠 MEMORY: No previous attempts found for this flow")
+            agent, flow_build_request = _prepare_flow_build(state, llm, flow_build_request_dict)
             
             # Use the unified approach for all scenarios (RAG currently disabled)
             # The method automatically handles user story, memory context, and optional retry context
             flow_response = agent.generate_flow_with_rag(flow_build_request)
             
-            # Enhanced debugging for the generated Flow XML
-            if flow_response.success and flow_response.flow_xml:
-                xml_length = len(flow_response.flow_xml)
-                xml_snippet = flow_response.flow_xml[:200].replace('\n', ' ').replace('\r', ' ')
-                
-                print(f"📄 GENERATED FLOW XML:")
-                print(f"   XML Length: {xml_length} characters")
-                print(f"   XML Preview: {xml_snippet}...")
-                
-                if flow_build_request.retry_context:
-                    retry_attempt = flow_build_request.retry_context.get('retry_attempt', 1)
-                    print(f"   🔄 This is UPDATED XML for retry #{retry_attempt}")
-                    print(f"   🛠️  Applied fixes to address deployment failure")
-                    
-                    # Show what elements were created/modified
-                    if flow_response.elements_created:
-                        print(f"   🧱 Elements created: {', '.join(flow_response.elements_created)}")
-                    if flow_response.variables_created:
-                        print(f"   📊 Variables created: {', '.join(flow_response.variables_created)}")
-                else:
-                    print(f"   🆕 This is INITIAL XML for first attempt")
-                    
-            # Save updated memory data back to state for persistence
-            updated_memory_data = agent.get_memory_data_for_persistence()
-            response_updates["flow_builder_memory_data"] = updated_memory_data
-            print(f"🧠 MEMORY: Persisted memory data for {len(updated_memory_data)} flows")
-            
-            # Convert response to dict for state storage
-            response_updates["current_flow_build_response"] = flow_response.model_dump()
-            
-            if flow_response.success:
-                print(f"✅ Flow building successful for: {flow_build_request.flow_api_name}")
-                print(f"🧠 MEMORY: Saved successful attempt to memory")
-                if flow_build_request.retry_context:
-                    retry_attempt = flow_build_request.retry_context.get('retry_attempt', 1)
-                    print(f"   🎯 Successfully rebuilt flow addressing deployment issues (retry #{retry_attempt})")
-                    print(f"   🔄 Maintained business requirements while fixing deployment errors")
-                    print(f"   🧠 Incorporated insights from previous attempts")
-                    print(f"   ➡️  This UPDATED XML will now go to deployment agent")
-                else:
-                    print(f"   📋 Successfully built flow meeting user story requirements")
-                    print(f"   ➡️  This INITIAL XML will now go to deployment agent")
-            else:
-                print(f"❌ Flow building failed: {flow_response.error_message}")
-                print(f"🧠 MEMORY: Saved failed attempt to memory for future learning")
-                
+            _record_flow_build(agent, flow_build_request, flow_response, response_updates)
         except Exception as e:
-            error_message = f"Enhanced FlowBuilderAgent error: {str(e)}"
-            print(error_message)
-            
-            error_response = FlowBuildResponse(
-                success=False,
-                input_request=FlowBuildRequest(**flow_build_request_dict),
-                error_message=error_message
-            )
-            response_updates["current_flow_build_response"] = error_response.model_dump()
+            _record_flow_build_error(flow_build_request_dict, e, response_updates)
     else:
         print("Enhanced FlowBuilderAgent: No current_flow_build_request to process.")
     
-    # Merge updates with the current state
-    updated_state = state.copy()
-    for key, value in response_updates.items():
-        updated_state[key] = value
+    return response_updates
+
+
+async def arun_enhanced_flow_builder_agent(state: AgentWorkforceState, llm: BaseLanguageModel) -> AgentWorkforceState:
+    """
+    Async variant of run_enhanced_flow_builder_agent that awaits the LLM call
+    """
+    print("----- ENHANCED FLOW BUILDER AGENT (with Memory, RAG disabled) -----")
+    
+    flow_build_request_dict = state.get("current_flow_build_request")
+    # Only the changed keys are returned; LangGraph merges them into the graph state
+    response_updates: AgentWorkforceState = {}
+    
+    if flow_build_request_dict:
+        try:
+            agent, flow_build_request = _prepare_flow_build(state, llm, flow_build_request_dict)
+            
+            flow_response = await agent.agenerate_flow_with_rag(flow_build_request)
+            
+            _record_flow_build(agent, flow_build_request, flow_response, response_updates)
+        except Exception as e:
+            _record_flow_build_error(flow_build_request_dict, e, response_updates)
+    else:
+        print("Enhanced FlowBuilderAgent: No current_flow_build_request to process.")
     
-    return updated_state
+    return response_updates
 
 # Example usage
 if __name__ == "__main__":
@@ -297,15 +297,13 @@ def run_flow_validation_agent(state: AgentWorkforceState, llm: BaseLanguageModel
     
     flow_build_response_dict = state.get("current_flow_build_response")
     build_deploy_retry_count = state.get("build_deploy_retry_count", 0)
-    response_updates = {}
+    # Only the changed keys are returned; LangGraph merges them into the graph state
+    response_updates: AgentWorkforceState = {}
     
     if not flow_build_response_dict:
         print("❌ No flow build response found to validate")
         response_updates["error_message"] = "No flow build response available for validation"
-        updated_state = state.copy()
-        for key, value in response_updates.items():
-            updated_state[key] = value
-        return updated_state
+        return response_updates
     
     try:
         # Parse the flow build response
@@ -314,16 +312,12 @@ def run_flow_validation_agent(state: AgentWorkforceState, llm: BaseLanguageModel
         if not flow_build_response.success:
             print("❌ Flow build was not successful, skipping validation")
             # No validation needed if flow build failed
-            updated_state = state.copy()
-            return updated_state
+            return response_updates
         
         if not flow_build_response.flow_xml:
             print("❌ No flow XML found in build response")
             response_updates["error_message"] = "No flow XML available for validation"
-            updated_state = state.copy()
-            for key, value in response_updates.items():
-                updated_state[key] = value
-            return updated_state
+            return response_updates
         
         print(f"🔍 Validating flow: {flow_build_response.input_request.flow_api_name}")
         print(f"📄 Flow XML length: {len(flow_build_response.flow_xml)} characters")
@@ -442,9 +436,4 @@ def run_flow_validation_agent(state: AgentWorkforceState, llm: BaseLanguageModel
         response_updates["error_message"] = error_message
         response_updates["validation_requires_retry"] = False
     
-    # Update state
-    updated_state = state.copy()
-    for key, value in response_updates.items():
-        updated_state[key] = value
-    
-    return updated_state 
\ No newline at end of file
+    return response_updates 
\ No newline at end of file
@@ -2,6 +2,7 @@
 import os
 from pathlib import Path
 from dotenv import load_dotenv
+from langchain_core.messages import HumanMessage
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain.agents import AgentExecutor, create_tool_calling_agent
 
@@ -19,7 +20,7 @@ from src.schemas.test_designer_schemas import (
     TestScenario, ApexTestClass, SalesforceObjectInfo
 )
 from src.state.agent_workforce_state import AgentWorkforceState
-from src.config import get_llm
+from src.config import get_llm, build_system_message
 
 # Load environment variables
 dotenv_path = Path(__file__).resolve().parent.parent.parent / ".env"
@@ -145,7 +146,7 @@ def run_test_designer_agent(state: AgentWorkforceState) -> AgentWorkforceState:
     
     if not test_designer_request_dict:
         print("TestDesigner Agent: No test_designer_request provided in current_test_designer_request.")
-        updated_state = state.copy()
+        updated_state: AgentWorkforceState = {}
         error_response = TestDesignerResponse(
             success=False,
             request=TestDesignerRequest(
@@ -174,7 +175,7 @@ def run_test_designer_agent(state: AgentWorkforceState) -> AgentWorkforceState:
         # Create test response using direct LLM generation with retry context
         test_response = _generate_test_design_with_llm(test_request, retry_context)
         
-        updated_state = state.copy()
+        updated_state: AgentWorkforceState = {}
         updated_state["current_test_designer_response"] = test_response.model_dump()
         
         # Store test scenarios and Apex classes in state
@@ -197,7 +198,7 @@ def run_test_designer_agent(state: AgentWorkforceState) -> AgentWorkforceState:
         import traceback
         print(f"DEBUG: Traceback: {traceback.format_exc()}")
         
-        updated_state = state.copy()
+        updated_state: AgentWorkforceState = {}
         error_response = TestDesignerResponse(
             success=False,
             request=TestDesignerRequest(
@@ -222,7 +223,7 @@ def _generate_test_design_with_llm(request: TestDesignerRequest, retry_context:
     """
     
     try:
-        # Build dynamic system prompt based on retry context
+        # Static system prompt; request details and retry context go in the human message
         base_system_prompt = """You are an expert Salesforce Apex developer. Generate ONLY valid, complete, production-ready Apex test class code.
 
 DO NOT include explanations, comments about the code structure, or any text outside the Apex class.
@@ -255,12 +256,31 @@ TDD Testing Approach:
 - Test business logic outcomes, not Flow execution
 - Focus on the acceptance criteria and expected behavior"""
 
-        # Add retry-specific guidance
+        # Format the inputs
+        user_story_text = f"{request.user_story.get('title', 'N/A')} - {request.user_story.get('description', 'N/A')}"
+        acceptance_criteria_text = "\n".join([f"- {ac}" for ac in request.acceptance_criteria])
+        target_objects_text = ", ".join(request.target_objects) if request.target_objects else "Standard objects"
+        
+        human_prompt = f"""Generate a complete Apex test class for this Salesforce Flow using TDD approach:
+
+Flow Name: {request.flow_name}
+Flow Type: {request.flow_type}
+Target Objects: {target_objects_text}
+
+User Story: {user_story_text}
+
+Acceptance Criteria:
+{acceptance_criteria_text}
+
+Generate ONLY the Apex test class code that tests the EXPECTED OUTCOMES - no explanations, no markdown, just raw deployable Apex code that tests what the Flow should accomplish."""
+
+        # Add retry-specific guidance to the human message, not the system prompt, so the
+        # system prompt stays byte-identical across retries and remains prompt-cacheable
         if retry_context:
             retry_errors = retry_context.get("previous_errors", [])
             if retry_errors:
                 error_analysis = _analyze_previous_errors(retry_errors)
-                base_system_prompt += f"""
+                human_prompt += f"""
 
 CRITICAL RETRY CONTEXT - FIX THESE ISSUES:
 {retry_context.get('guidance', '')}
@@ -276,36 +296,11 @@ MANDATORY FIXES:
 5. Include proper return statements where needed
 6. Ensure proper Apex syntax throughout"""
 
-        # Create a simplified prompt that outputs only Apex code
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", base_system_prompt),
-            
-            ("human", """Generate a complete Apex test class for this Salesforce Flow using TDD approach:
-
-Flow Name: {flow_name}
-Flow Type: {flow_type}
-Target Objects: {target_objects}
-
-User Story: {user_story_text}
-
-Acceptance Criteria:
-{acceptance_criteria_text}
-
-Generate ONLY the Apex test class code that tests the EXPECTED OUTCOMES - no explanations, no markdown, just raw deployable Apex code that tests what the Flow should accomplish.""")
-        ])
-        
-        # Format the inputs
-        user_story_text = f"{request.user_story.get('title', 'N/A')} - {request.user_story.get('description', 'N/A')}"
-        acceptance_criteria_text = "\n".join([f"- {ac}" for ac in request.acceptance_criteria])
-        
         # Create the messages
-        messages = prompt.format_messages(
-            flow_name=request.flow_name,
-            flow_type=request.flow_type,
-            target_objects=", ".join(request.target_objects) if request.target_objects else "Standard objects",
-            user_story_text=user_story_text,
-            acceptance_criteria_text=acceptance_criteria_text
-        )
+        messages = [
+            build_system_message(LLM, base_system_prompt),
+            HumanMessage(content=human_prompt)
+        ]
         
         # Get LLM response
         if retry_context:
@@ -1,8 +1,11 @@
 # Core LangChain and LLM imports
+import functools
+import logging
 import os
 from pathlib import Path
 from dotenv import load_dotenv
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from langchain_core.messages import SystemMessage
 from langchain.agents import AgentExecutor, create_tool_calling_agent
 
 # Typing and Pydantic models
@@ -16,148 +19,195 @@ from src.schemas.test_executor_schemas import (
 from src.state.agent_workforce_state import AgentWorkforceState
 from src.config import get_llm
 
+logger = logging.getLogger(__name__)
+
 # Load environment variables
 dotenv_path = Path(__file__).resolve().parent.parent.parent / ".env"
 load_dotenv(dotenv_path=dotenv_path)
 
-# Get LLM instance for test executor agent (keeping for potential future use)
-LLM = get_llm(
-    agent_name="TEST_EXECUTOR",
-    temperature=0.1,  # Low temperature for consistent test execution
-    max_tokens=2048  # Sufficient for test analysis and reporting
-)
+# Shared tool instance; the tool keeps no per-run state
+APEX_TEST_TOOL = ApexTestRunnerTool()
 
-# Initialize tools
-TEST_EXECUTOR_TOOLS = [
-    ApexTestRunnerTool()
-]
+def _test_executor_error_state(request_id: str, error_message: str) -> AgentWorkforceState:
+    """Build the state update for a TestExecutor run that could not produce results."""
+    # Return only the changed keys; LangGraph merges them into the graph state
+    updated_state: AgentWorkforceState = {}
+    # Error responses come from trusted inputs, so skip validation; the original
+    # request is optional and left out rather than rebuilt with a placeholder session
+    error_response = TestExecutorResponse.model_construct(
+        request_id=request_id,
+        success=False,
+        error_message=error_message
+    )
+    updated_state["current_test_executor_response"] = error_response.model_dump(mode="json")
+    updated_state["current_test_executor_request"] = None
+    return updated_state
 
-def run_test_executor_agent(state: AgentWorkforceState) -> AgentWorkforceState:
-    """
-    Executes the TestExecutor agent and updates the graph state with test execution results.
-    Now directly calls the ApexTestRunnerTool instead of using LLM agent to avoid processing raw results.
-    """
-    print("--- Running TestExecutor Agent ---")
+
+def _prepare_test_request(state: AgentWorkforceState) -> TestExecutorRequest:
+    """Rebuild the TestExecutorRequest from state and log what is about to run."""
+    test_executor_request_dict = state["current_test_executor_request"]
+    
+    # Upstream nodes may hand over the model itself; only validate serialized dicts
+    if isinstance(test_executor_request_dict, TestExecutorRequest):
+        test_request = test_executor_request_dict
+    else:
+        logger.debug(
+            "Attempting to create TestExecutorRequest: request_id=%s, test_classes=%d",
+            test_executor_request_dict.get("request_id"),
+            len(test_executor_request_dict.get("test_class_names") or [])
+        )
+        test_request = TestExecutorRequest.model_validate(test_executor_request_dict)
+    
+    logger.info("✅ TestExecutor Agent processing request for %d test classes", len(test_request.test_class_names))
+    logger.info("📋 Test classes: %s", test_request.test_class_names)
+    logger.info("🏢 Org: %s", test_request.salesforce_session.instance_url)
+    logger.info("🎯 Coverage target: %s%%", test_request.coverage_target)
+    
+    logger.info("🧪 Executing test execution directly with ApexTestRunnerTool...")
+    return test_request
+
+
+def _apply_test_response(test_response: TestExecutorResponse) -> AgentWorkforceState:
+    """Build the state update for a completed TestExecutorResponse."""
+    logger.info("✅ TestExecutor Tool completed execution")
+    logger.info("📊 Success: %s", test_response.success)
+    
+    if test_response.success:
+        logger.info("📈 Test Results: %d test methods", len(test_response.test_results))
+        logger.info("📊 Coverage Results: %d classes", len(test_response.code_coverage_results))
+        if test_response.overall_coverage_percentage:
+            logger.info("🎯 Overall Coverage: %s%%", test_response.overall_coverage_percentage)
+    else:
+        logger.warning("❌ Test execution failed: %s", test_response.error_message)
+    
+    # Return only the changed keys; LangGraph merges them into the graph state
+    updated_state: AgentWorkforceState = {}
+    # Serialize once in a single pydantic-core pass; the per-result lists are already
+    # sub-trees of this dump. JSON mode keeps enums as plain strings for checkpointing.
+    test_response_dict = test_response.model_dump(mode="json")
+    updated_state["current_test_executor_response"] = test_response_dict
+    
+    # Store test execution results in state for other agents to use
+    if test_response.success:
+        updated_state["test_execution_results"] = test_response_dict["test_results"]
+        updated_state["code_coverage_results"] = test_response_dict["code_coverage_results"]
+        updated_state["test_execution_summary"] = test_response_dict["test_run_summary"]
+        
+        # Per-result detail is only walked when DEBUG logging is enabled,
+        # and each section is emitted as a single log record
+        if logger.isEnabledFor(logging.DEBUG):
+            result_lines = []
+            for test_result in test_response.test_results:
+                status_emoji = "✅" if test_result.outcome == "Pass" else "❌"
+                result_lines.append(f"   {status_emoji} {test_result.test_class_name}.{test_result.test_method_name}: {test_result.outcome}")
+                if test_result.message and test_result.outcome != "Pass":
+                    result_lines.append(f"      Message: {test_result.message}")
+            logger.debug("📊 DETAILED TEST RESULTS:\n%s", "\n".join(result_lines))
+            
+            coverage_lines = [
+                f"   📋 {coverage.apex_class_or_trigger_name}: {coverage.coverage_percentage}% "
+                f"({coverage.num_lines_covered}/{coverage.num_lines_covered + coverage.num_lines_uncovered} lines)"
+                for coverage in test_response.code_coverage_results
+            ]
+            logger.debug("📈 COVERAGE RESULTS:\n%s", "\n".join(coverage_lines))
+    
+    # Clear the request after processing
+    updated_state["current_test_executor_request"] = None
+    
+    return updated_state
+
+
+def _handle_test_executor_exception(state: AgentWorkforceState, e: Exception) -> AgentWorkforceState:
+    """Turn an unexpected exception into an error response in state."""
+    logger.exception("TestExecutor Agent: Error processing test execution: %s", e)
+    
+    # Try to get request_id from the original request
+    test_executor_request_dict = state.get("current_test_executor_request")
+    request_id = "unknown"
+    if isinstance(test_executor_request_dict, TestExecutorRequest):
+        request_id = test_executor_request_dict.request_id
+    elif test_executor_request_dict and isinstance(test_executor_request_dict, dict):
+        request_id = test_executor_request_dict.get("request_id", "unknown")
+    
+    return _test_executor_error_state(
+        request_id, f"TestExecutor Agent Processing Error: {str(e)}"
+    )
+
+
+def _has_test_executor_request(state: AgentWorkforceState) -> bool:
+    """Log the incoming state and report whether a request is present."""
+    logger.info("--- Running TestExecutor Agent ---")
     
-    # Debug logging
-    print(f"DEBUG: Received state keys: {list(state.keys())}")
+    # Debug logging (keys only - the request carries the Salesforce session token)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Received state keys: %s", list(state.keys()))
     
     test_executor_request_dict = state.get("current_test_executor_request")
-    print(f"DEBUG: test_executor_request_dict = {test_executor_request_dict}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "test_executor_request keys=%s",
+            list(test_executor_request_dict) if isinstance(test_executor_request_dict, dict)
+            else type(test_executor_request_dict).__name__
+        )
     
     if not test_executor_request_dict:
-        print("TestExecutor Agent: No test_executor_request provided in current_test_executor_request.")
-        updated_state = state.copy()
-        error_response = TestExecutorResponse(
-            request_id="unknown",
-            success=False,
-            request=TestExecutorRequest(
-                request_id="unknown",
-                salesforce_session=state.get("salesforce_session", {}),
-                test_class_names=[],
-                org_alias="unknown"
-            ),
-            error_message="TestExecutor Agent Error: No test_executor_request provided."
+        logger.warning("TestExecutor Agent: No test_executor_request provided in current_test_executor_request.")
+        return False
+    return True
+
+
+def run_test_executor_agent(state: AgentWorkforceState) -> AgentWorkforceState:
+    """
+    Executes the TestExecutor agent and returns the state update with test execution results.
+    Now directly calls the ApexTestRunnerTool instead of using LLM agent to avoid processing raw results.
+    """
+    if not _has_test_executor_request(state):
+        return _test_executor_error_state(
+            "unknown", "TestExecutor Agent Error: No test_executor_request provided."
         )
-        updated_state["current_test_executor_response"] = error_response.model_dump()
-        return updated_state
 
     try:
-        # Convert dict back to Pydantic model
-        print(f"DEBUG: Attempting to create TestExecutorRequest from: {test_executor_request_dict}")
-        test_request = TestExecutorRequest(**test_executor_request_dict)
-        
-        print(f"✅ TestExecutor Agent processing request for {len(test_request.test_class_names)} test classes")
-        print(f"📋 Test classes: {test_request.test_class_names}")
-        print(f"🏢 Org: {test_request.salesforce_session.instance_url}")
-        print(f"🎯 Coverage target: {test_request.coverage_target}%")
-        
-        # Create the ApexTestRunnerTool directly
-        apex_test_tool = ApexTestRunnerTool()
-        
-        print("🧪 Executing test execution directly with ApexTestRunnerTool...")
+        test_request = _prepare_test_request(state)
         
         # Call the tool directly with the full request
         # This bypasses the LLM agent and provides raw test execution results
-        test_response = apex_test_tool._run(full_request=test_request.model_dump())
-        
-        print(f"✅ TestExecutor Tool completed execution")
-        print(f"📊 Success: {test_response.success}")
-        
-        if test_response.success:
-            print(f"📈 Test Results: {len(test_response.test_results)} test methods")
-            print(f"📊 Coverage Results: {len(test_response.code_coverage_results)} classes")
-            if test_response.overall_coverage_percentage:
-                print(f"🎯 Overall Coverage: {test_response.overall_coverage_percentage}%")
-        else:
-            print(f"❌ Test execution failed: {test_response.error_message}")
-        
-        updated_state = state.copy()
-        updated_state["current_test_executor_response"] = test_response.model_dump()
+        test_response = APEX_TEST_TOOL._run(full_request=test_request)
         
-        # Store test execution results in state for other agents to use
-        if test_response.success:
-            updated_state["test_execution_results"] = [result.model_dump() for result in test_response.test_results]
-            updated_state["code_coverage_results"] = [result.model_dump() for result in test_response.code_coverage_results]
-            updated_state["test_execution_summary"] = test_response.test_run_summary.model_dump() if test_response.test_run_summary else None
-            
-            # Log detailed results for transparency
-            print(f"📊 DETAILED TEST RESULTS:")
-            for test_result in test_response.test_results:
-                status_emoji = "✅" if test_result.outcome == "Pass" else "❌"
-                print(f"   {status_emoji} {test_result.test_class_name}.{test_result.test_method_name}: {test_result.outcome}")
-                if test_result.message and test_result.outcome != "Pass":
-                    print(f"      Message: {test_result.message}")
-            
-            print(f"📈 COVERAGE RESULTS:")
-            for coverage in test_response.code_coverage_results:
-                print(f"   📋 {coverage.apex_class_or_trigger_name}: {coverage.coverage_percentage}% ({coverage.num_lines_covered}/{coverage.num_lines_covered + coverage.num_lines_uncovered} lines)")
-        else:
-            print(f"⚠️ Test execution failed: {test_response.error_message}")
-        
-        # Clear the request after processing
-        updated_state["current_test_executor_request"] = None
-        
-        return updated_state
+        return _apply_test_response(test_response)
 
     except Exception as e:
-        print(f"TestExecutor Agent: Error processing test execution: {str(e)}")
-        import traceback
-        print(f"DEBUG: Traceback: {traceback.format_exc()}")
-        
-        updated_state = state.copy()
-        
-        # Try to get request_id from the original request
-        request_id = "unknown"
-        if test_executor_request_dict and isinstance(test_executor_request_dict, dict):
-            request_id = test_executor_request_dict.get("request_id", "unknown")
-        
-        error_response = TestExecutorResponse(
-            request_id=request_id,
-            success=False,
-            request=TestExecutorRequest(
-                request_id=request_id,
-                salesforce_session=state.get("salesforce_session") or {
-                    "success": False,
-                    "session_id": "",
-                    "instance_url": "",
-                    "user_id": "unknown",
-                    "org_id": "unknown",
-                    "auth_type_used": "unknown"
-                },
-                test_class_names=[],
-                org_alias="unknown"
-            ),
-            error_message=f"TestExecutor Agent Processing Error: {str(e)}"
+        return _handle_test_executor_exception(state, e)
+
+
+async def arun_test_executor_agent(state: AgentWorkforceState) -> AgentWorkforceState:
+    """
+    Async variant of run_test_executor_agent.
+    Awaits the Apex test run so other graph nodes can make progress while Salesforce executes tests.
+    """
+    if not _has_test_executor_request(state):
+        return _test_executor_error_state(
+            "unknown", "TestExecutor Agent Error: No test_executor_request provided."
         )
-        updated_state["current_test_executor_response"] = error_response.model_dump()
-        updated_state["current_test_executor_request"] = None
+
+    try:
+        test_request = _prepare_test_request(state)
         
-        return updated_state
+        test_response = await APEX_TEST_TOOL._arun(full_request=test_request)
+        
+        return _apply_test_response(test_response)
+
+    except Exception as e:
+        return _handle_test_executor_exception(state, e)
 
 # Keeping the legacy functions for backward compatibility but they won't be used
-TEST_EXECUTOR_AGENT_PROMPT_TEMPLATE = ChatPromptTemplate.from_messages([
-    ("system", """
+@functools.cache
+def get_test_executor_agent_prompt_template() -> ChatPromptTemplate:
+    """Prompt for the legacy agent executor, built on first use rather than at import."""
+    # The system prompt has no placeholders, so pass it as a literal SystemMessage
+    # to skip template rendering on every invoke
+    return ChatPromptTemplate.from_messages([
+        SystemMessage(content="""
     You are a specialized Salesforce Test Executor Agent with expertise in running and analyzing Apex test results.
     
     Your primary responsibilities:
@@ -189,7 +239,7 @@ TEST_EXECUTOR_AGENT_PROMPT_TEMPLATE = ChatPromptTemplate.from_messages([
     Always provide clear, detailed test execution reports that development teams can use immediately
     to understand test results and take corrective action.
     """),
-    ("user", """
+        ("user", """
     Please execute the Apex test classes with the following request:
     
     Request ID: {request_id}
@@ -203,17 +253,24 @@ TEST_EXECUTOR_AGENT_PROMPT_TEMPLATE = ChatPromptTemplate.from_messages([
     Use the apex_test_runner_tool to execute these tests and provide detailed analysis of the results.
     Focus on returning actionable feedback for any failures and comprehensive coverage information.
     """)
-])
+        ])
 
 def create_test_executor_agent_executor() -> AgentExecutor:
     """
     Creates the LangChain agent executor for the TestExecutor Agent.
     NOTE: This is now deprecated in favor of direct tool calling for raw results.
     """
-    agent = create_tool_calling_agent(LLM, TEST_EXECUTOR_TOOLS, TEST_EXECUTOR_AGENT_PROMPT_TEMPLATE)
+    # The LLM is only needed here, so provider clients are not created at import
+    llm = get_llm(
+        agent_name="TEST_EXECUTOR",
+        temperature=0.1,  # Low temperature for consistent test execution
+        max_tokens=2048  # Sufficient for test analysis and reporting
+    )
+    tools = [APEX_TEST_TOOL]
+    agent = create_tool_calling_agent(llm, tools, get_test_executor_agent_prompt_template())
     agent_executor = AgentExecutor(
         agent=agent, 
-        tools=TEST_EXECUTOR_TOOLS, 
+        tools=tools, 
         verbose=True,
         handle_parsing_errors=True,
         max_iterations=3,  # Limited iterations since this is primarily tool execution
@@ -245,7 +302,7 @@ def _extract_test_response_from_agent_result(agent_result: Dict[str, Any], test_
                     try:
                         return TestExecutorResponse(**observation)
                     except Exception as e:
-                        print(f"⚠️ Could not reconstruct TestExecutorResponse from dict: {e}")
+                        logger.warning("Could not reconstruct TestExecutorResponse from dict: %s", e)
     
     # If we couldn't extract a proper response, create an error response
     agent_output = agent_result.get("output", "No detailed output available")
@@ -1,5 +1,10 @@
 # Core LangChain and LLM imports
+import asyncio
+import functools
+import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
 from pathlib import Path
 from dotenv import load_dotenv
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
@@ -19,24 +24,39 @@ from src.schemas.web_search_schemas import (
 from src.state.agent_workforce_state import AgentWorkforceState
 from src.config import get_llm
 
+logger = logging.getLogger(__name__)
+
 # Load environment variables from .env file
 dotenv_path = Path(__file__).resolve().parent.parent.parent / ".env"
 load_dotenv(dotenv_path=dotenv_path)
 
 # Note: TAVILY_API_KEY is checked when tools are actually used
 
-# Get LLM instance for web search agent
-LLM = get_llm(
-    agent_name="WEB_SEARCH",
-    temperature=0.1, 
-    max_tokens=4096
-)
+@functools.lru_cache(maxsize=1)
+def _llm():
+    """LLM for the web search agent, built on first use rather than at import."""
+    return get_llm(
+        agent_name="WEB_SEARCH",
+        temperature=0.1, 
+        max_tokens=4096
+    )
+
+# Hosts treated as official/authoritative sources in recommendations (subdomains included)
+OFFICIAL_HOSTS = frozenset({
+    'salesforce.com', 'trailhead.salesforce.com', 'developer.salesforce.com',
+    'docs.python.org', 'github.com', 'stackoverflow.com'
+})
+# Title/content phrases that mark a result as a tutorial
+TUTORIAL_TERMS = ('tutorial', 'guide', 'how to', 'step by step')
+
+# Shared tool instance for direct structured searches; the Tavily client is cached per API key
+WEB_SEARCH_TOOL = WebSearchTool()
 
 def get_web_search_tools():
     """Get web search tools with proper error handling."""
     if not os.getenv("TAVILY_API_KEY"):
         raise ValueError("TAVILY_API_KEY not found in environment variables.")
-    return [WebSearchTool()]
+    return [WEB_SEARCH_TOOL]
 
 WEB_SEARCH_AGENT_PROMPT_TEMPLATE = ChatPromptTemplate.from_messages([
     ("system", """
@@ -77,134 +97,231 @@ WEB_SEARCH_AGENT_PROMPT_TEMPLATE = ChatPromptTemplate.from_messages([
     MessagesPlaceholder(variable_name="agent_scratchpad"),
 ])
 
-def create_web_search_agent_executor() -> AgentExecutor:
+@functools.lru_cache(maxsize=4)
+def create_web_search_agent_executor(verbose: bool = True, handle_parsing_errors: bool = True) -> AgentExecutor:
     """
     Creates the LangChain agent executor for the WebSearchAgent.
+    Verbose tracing and parsing-error recovery both add per-step overhead and can be turned off.
+    The executor holds no per-call state (no memory), so one instance per option set is
+    built and shared, including across concurrent invokes.
     """
     tools = get_web_search_tools()
-    agent = create_tool_calling_agent(LLM, tools, WEB_SEARCH_AGENT_PROMPT_TEMPLATE)
+    agent = create_tool_calling_agent(_llm(), tools, WEB_SEARCH_AGENT_PROMPT_TEMPLATE)
     agent_executor = AgentExecutor(
         agent=agent,
         tools=tools,
-        verbose=True,
-        handle_parsing_errors=True,
+        verbose=verbose,
+        handle_parsing_errors=handle_parsing_errors,
         max_iterations=3  # Prevent infinite loops
     )
     return agent_executor
 
-def run_web_search_agent(state: AgentWorkforceState) -> AgentWorkforceState:
-    """
-    Executes the web search agent and updates the graph state based on the outcome.
-    Expects 'current_web_search_request' to be set in the input state.
-    """
-    print("--- Running Web Search Agent ---")
+def _web_search_error_response(error_message: str) -> WebSearchAgentResponse:
+    """Build the response for a web search that could not be completed."""
+    return WebSearchAgentResponse(
+        success=False,
+        error_message=error_message
+    )
+
+
+def _web_search_state(agent_response: WebSearchAgentResponse) -> AgentWorkforceState:
+    """Build the state update for a finished web search."""
+    # Return only the changed keys; LangGraph merges them into the graph state
+    updated_state: AgentWorkforceState = {}
+    # JSON mode stores enums and other non-JSON types as primitives, so the state
+    # can be serialized (tracing, checkpointing) without a custom encoder
+    updated_state["current_web_search_response"] = agent_response.model_dump(mode="json")
+    
+    # Clear the request after processing
+    updated_state["current_web_search_request"] = None
+    return updated_state
+
+
+def _web_search_error_state(error_message: str) -> AgentWorkforceState:
+    """Build the state update for a web search that could not be completed."""
+    return _web_search_state(_web_search_error_response(error_message))
+
+
+def _parse_web_search_request(state: AgentWorkforceState) -> Optional[WebSearchAgentRequest]:
+    """Log the incoming state and rebuild the WebSearchAgentRequest, if any."""
+    logger.info("--- Running Web Search Agent ---")
     
     # Debug logging
-    print(f"DEBUG: Received state keys: {list(state.keys())}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Received state keys: %s", list(state.keys()))
     
     web_search_request_dict = state.get("current_web_search_request")
-    print(f"DEBUG: web_search_request_dict = {web_search_request_dict}")
+    logger.debug("web_search_request_dict = %s", web_search_request_dict)
     
     if not web_search_request_dict:
-        print("Web Search Agent: No web search request provided in current_web_search_request.")
-        updated_state = state.copy()
-        response = WebSearchAgentResponse(
-            success=False,
-            error_message="Web Search Agent Error: No web search request provided."
-        )
-        updated_state["current_web_search_response"] = response.model_dump()
-        return updated_state
+        logger.warning("Web Search Agent: No web search request provided in current_web_search_request.")
+        return None
+    
+    # Upstream nodes may hand over the model itself; only validate serialized dicts
+    if isinstance(web_search_request_dict, WebSearchAgentRequest):
+        return web_search_request_dict
+    agent_request = WebSearchAgentRequest.model_validate(web_search_request_dict)
+    logger.debug("Successfully created WebSearchAgentRequest, query = %s", agent_request.search_request.query)
+    return agent_request
+
+
+def _build_agent_input(agent_request: WebSearchAgentRequest) -> Dict[str, Any]:
+    """Prepare the prompt variables for the web search agent executor."""
+    search_request = agent_request.search_request
+    return {
+        "query": search_request.query,
+        "max_results": search_request.max_results,
+        "search_depth": search_request.search_depth.value,
+        "topic": search_request.topic or "general",
+        "agent_instructions": agent_request.agent_instructions or "No specific instructions provided.",
+        "context": agent_request.context or "No additional context provided."
+    }
+
+
+def _extract_agent_output(agent_result: Dict[str, Any]) -> str:
+    """Flatten the agent executor output into plain text."""
+    agent_output = agent_result.get("output", "")
+    
+    # Handle case where output might be a list of message parts
+    if isinstance(agent_output, list):
+        # Extract text from message parts
+        text_parts = []
+        for part in agent_output:
+            if isinstance(part, dict) and part.get("type") == "text":
+                text_parts.append(part.get("text", ""))
+        agent_output = "\n".join(text_parts) if text_parts else str(agent_output)
+    elif not isinstance(agent_output, str):
+        agent_output = str(agent_output)
+    
+    return agent_output
+
+
+def _summarize_search_response(search_response: WebSearchResponse) -> str:
+    """Build a plain summary from the structured results when the LLM agent is skipped."""
+    if search_response.answer:
+        return search_response.answer
+    if not search_response.results:
+        return "No results found."
+    titles = "\n".join(f"- {result.title} ({result.url})" for result in search_response.results[:3])
+    return f"Top results:\n{titles}"
+
+
+def _build_agent_response(
+    search_request: WebSearchRequest,
+    agent_output: str,
+    search_response: WebSearchResponse
+) -> WebSearchAgentResponse:
+    """Combine the agent summary and structured results into a WebSearchAgentResponse."""
+    # Generate follow-up queries based on the results
+    follow_up_queries = _generate_follow_up_queries(search_request.query, search_response)
+    
+    # Generate recommendations
+    recommendations = _generate_recommendations(search_response)
+    
+    # Create agent response
+    agent_response = WebSearchAgentResponse(
+        success=True,
+        search_response=search_response,
+        summary=agent_output,
+        recommendations=recommendations,
+        follow_up_queries=follow_up_queries,
+        processing_notes=f"Processed search query '{search_request.query}' with {len(search_response.results)} results"
+    )
     
-    try:
-        # Convert dict back to Pydantic model
-        print(f"DEBUG: Attempting to create WebSearchAgentRequest from: {web_search_request_dict}")
-        agent_request = WebSearchAgentRequest(**web_search_request_dict)
-        search_request = agent_request.search_request
-        print(f"DEBUG: Successfully created WebSearchAgentRequest, query = {search_request.query}")
-        
-        # Create agent executor
-        agent_executor = create_web_search_agent_executor()
-        
-        # Prepare input for the agent
-        agent_input = {
-            "query": search_request.query,
-            "max_results": search_request.max_results,
-            "search_depth": search_request.search_depth.value,
-            "topic": search_request.topic or "general",
-            "agent_instructions": agent_request.agent_instructions or "No specific instructions provided.",
-            "context": agent_request.context or "No additional context provided."
-        }
-        
-        # Execute the agent
-        print(f"Executing web search for query: '{search_request.query}'")
-        agent_result = agent_executor.invoke(agent_input)
-        
-        # Extract the agent's response
-        agent_output = agent_result.get("output", "")
-        
-        # Handle case where output might be a list of message parts
-        if isinstance(agent_output, list):
-            # Extract text from message parts
-            text_parts = []
-            for part in agent_output:
-                if isinstance(part, dict) and part.get("type") == "text":
-                    text_parts.append(part.get("text", ""))
-            agent_output = "\n".join(text_parts) if text_parts else str(agent_output)
-        elif not isinstance(agent_output, str):
-            agent_output = str(agent_output)
-        
-        # Also perform the direct search to get structured results
-        web_search_tool = WebSearchTool()
-        search_response = web_search_tool._run(
-            query=search_request.query,
-            max_results=search_request.max_results,
-            search_depth=search_request.search_depth.value,
-            include_domains=search_request.include_domains,
-            exclude_domains=search_request.exclude_domains,
-            include_answer=search_request.include_answer,
-            include_raw_content=search_request.include_raw_content,
-            topic=search_request.topic
+    logger.info("Web Search Agent: Successfully processed search for '%s' with %d results",
+                search_request.query, len(search_response.results))
+    
+    return agent_response
+
+
+def _handle_web_search_exception(e: Exception) -> AgentWorkforceState:
+    """Turn an unexpected exception into an error response in state."""
+    logger.exception("Web Search Agent: Error processing search: %s", e)
+    
+    return _web_search_error_state(f"Web Search Agent Processing Error: {str(e)}")
+
+
+def _execute_web_search(agent_request: WebSearchAgentRequest) -> WebSearchAgentResponse:
+    """Run the search (and, if requested, the summarizing agent) for a parsed request."""
+    search_request = agent_request.search_request
+    
+    # Fast path: structured results only, no LLM round trip
+    if not agent_request.summarize:
+        search_response = WEB_SEARCH_TOOL._perform_search(search_request)
+        return _build_agent_response(
+            search_request, _summarize_search_response(search_response), search_response
         )
-        
-        # Generate follow-up queries based on the results
-        follow_up_queries = _generate_follow_up_queries(search_request.query, search_response)
-        
-        # Generate recommendations
-        recommendations = _generate_recommendations(search_response)
-        
-        # Create agent response
-        agent_response = WebSearchAgentResponse(
-            success=True,
-            search_response=search_response,
-            summary=agent_output,
-            recommendations=recommendations,
-            follow_up_queries=follow_up_queries,
-            processing_notes=f"Processed search query '{search_request.query}' with {len(search_response.results)} results"
+    
+    # Create agent executor
+    agent_executor = create_web_search_agent_executor()
+    
+    # Execute the agent and, concurrently, the direct search for structured results.
+    # Both are network-bound and independent, so the node waits for the slower one only.
+    logger.info("Executing web search for query: '%s'", search_request.query)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        search_future = pool.submit(WEB_SEARCH_TOOL._perform_search, search_request)
+        agent_result = agent_executor.invoke(_build_agent_input(agent_request))
+        search_response = search_future.result()
+    agent_output = _extract_agent_output(agent_result)
+    
+    return _build_agent_response(search_request, agent_output, search_response)
+
+
+async def _aexecute_web_search(agent_request: WebSearchAgentRequest) -> WebSearchAgentResponse:
+    """
+    Async variant of _execute_web_search.
+    The agent summary and the direct Tavily search are independent, so they run concurrently.
+    """
+    search_request = agent_request.search_request
+    
+    if not agent_request.summarize:
+        search_response = await asyncio.to_thread(WEB_SEARCH_TOOL._perform_search, search_request)
+        return _build_agent_response(
+            search_request, _summarize_search_response(search_response), search_response
         )
+    
+    agent_executor = create_web_search_agent_executor()
+    
+    logger.info("Executing web search for query: '%s'", search_request.query)
+    agent_result, search_response = await asyncio.gather(
+        agent_executor.ainvoke(_build_agent_input(agent_request)),
+        asyncio.to_thread(WEB_SEARCH_TOOL._perform_search, search_request)
+    )
+    
+    return _build_agent_response(
+        search_request, _extract_agent_output(agent_result), search_response
+    )
+
+
+def run_web_search_agent(state: AgentWorkforceState) -> AgentWorkforceState:
+    """
+    Executes the web search agent and returns the resulting state update.
+    Expects 'current_web_search_request' to be set in the input state.
+    """
+    try:
+        agent_request = _parse_web_search_request(state)
+        if agent_request is None:
+            return _web_search_error_state("Web Search Agent Error: No web search request provided.")
         
-        updated_state = state.copy()
-        updated_state["current_web_search_response"] = agent_response.model_dump()
-        
-        # Clear the request after processing
-        updated_state["current_web_search_request"] = None
+        return _web_search_state(_execute_web_search(agent_request))
         
-        print(f"Web Search Agent: Successfully processed search for '{search_request.query}' with {len(search_response.results)} results")
+    except Exception as e:
+        return _handle_web_search_exception(e)
+
+
+async def arun_web_search_agent(state: AgentWorkforceState) -> AgentWorkforceState:
+    """
+    Async variant of run_web_search_agent.
+    """
+    try:
+        agent_request = _parse_web_search_request(state)
+        if agent_request is None:
+            return _web_search_error_state("Web Search Agent Error: No web search request provided.")
         
-        return updated_state
+        return _web_search_state(await _aexecute_web_search(agent_request))
         
     except Exception as e:
-        print(f"Web Search Agent: Error processing search: {str(e)}")
-        import traceback
-        print(f"DEBUG: Traceback: {traceback.format_exc()}")
-        
-        updated_state = state.copy()
-        response = WebSearchAgentResponse(
-            success=False,
-            error_message=f"Web Search Agent Processing Error: {str(e)}"
-        )
-        updated_state["current_web_search_response"] = response.model_dump()
-        updated_state["current_web_search_request"] = None
-        return updated_state
+        return _handle_web_search_exception(e)
 
 def _generate_follow_up_queries(original_query: str, search_response: WebSearchResponse) -> List[str]:
     """Generate follow-up search queries based on the results."""
@@ -224,14 +341,21 @@ def _generate_follow_up_queries(original_query: str, search_response: WebSearchR
     
     # Add related searches based on content
     if search_response.results:
-        first_result = search_response.results[0]
-        if "salesforce" in first_result.content.lower():
+        first_content = search_response.results[0].content.lower()
+        if "salesforce" in first_content:
             follow_ups.append(f"{original_query} salesforce documentation")
-        if "api" in first_result.content.lower():
+        if "api" in first_content:
             follow_ups.append(f"{original_query} api reference")
     
     return follow_ups[:3]  # Limit to 3 follow-up queries
 
+def _is_official_source(url: str) -> bool:
+    """Check whether a URL's host is, or is a subdomain of, one of OFFICIAL_HOSTS."""
+    # urlsplit lowercases the hostname; matching on it (not the raw URL) avoids
+    # false positives such as "salesforce.com.example.net" or a domain in the path
+    labels = (urlsplit(url).hostname or "").split(".")
+    return any(".".join(labels[i:]) in OFFICIAL_HOSTS for i in range(len(labels) - 1))
+
 def _generate_recommendations(search_response: WebSearchResponse) -> List[str]:
     """Generate recommendations based on search results."""
     recommendations = []
@@ -244,36 +368,37 @@ def _generate_recommendations(search_response: WebSearchResponse) -> List[str]:
         recommendations.append("No results found - try using different keywords or broader terms")
         return recommendations
     
-    # Analyze result quality
-    official_sources = []
-    tutorial_sources = []
+    # Analyze result quality in a single pass, lowercasing each field once
+    official_count = 0
+    tutorial_count = 0
+    has_deprecated = False
     
     for result in search_response.results:
-        url_lower = result.url.lower()
         title_lower = result.title.lower()
         content_lower = result.content.lower()
         
         # Check for official sources
-        if any(domain in url_lower for domain in ['salesforce.com', 'trailhead.salesforce.com', 'developer.salesforce.com']):
-            official_sources.append(result)
-        elif any(domain in url_lower for domain in ['docs.python.org', 'github.com', 'stackoverflow.com']):
-            official_sources.append(result)
+        if _is_official_source(result.url):
+            official_count += 1
         
         # Check for tutorials
-        if any(term in title_lower or term in content_lower for term in ['tutorial', 'guide', 'how to', 'step by step']):
-            tutorial_sources.append(result)
+        if any(term in title_lower or term in content_lower for term in TUTORIAL_TERMS):
+            tutorial_count += 1
+        
+        if not has_deprecated and "deprecated" in content_lower:
+            has_deprecated = True
     
-    if official_sources:
-        recommendations.append(f"Found {len(official_sources)} official documentation sources - prioritize these for accuracy")
+    if official_count:
+        recommendations.append(f"Found {official_count} official documentation sources - prioritize these for accuracy")
     
-    if tutorial_sources:
-        recommendations.append(f"Found {len(tutorial_sources)} tutorial resources for hands-on learning")
+    if tutorial_count:
+        recommendations.append(f"Found {tutorial_count} tutorial resources for hands-on learning")
     
     if search_response.answer:
         recommendations.append("AI-generated answer provided - verify with official sources for critical implementations")
     
     # Add specific recommendations based on content
-    if any("deprecated" in result.content.lower() for result in search_response.results):
+    if has_deprecated:
         recommendations.append("Some results mention deprecated features - ensure you're using current versions")
     
     return recommendations
@@ -286,7 +411,8 @@ def search_web(
     include_domains: Optional[List[str]] = None,
     exclude_domains: Optional[List[str]] = None,
     context: Optional[str] = None,
-    agent_instructions: Optional[str] = None
+    agent_instructions: Optional[str] = None,
+    summarize: bool = True
 ) -> WebSearchAgentResponse:
     """
     Standalone function to perform web search with agent analysis.
@@ -299,6 +425,7 @@ def search_web(
         exclude_domains: List of domains to exclude
         context: Additional context for the search
         agent_instructions: Specific instructions for the agent
+        summarize: Whether to have the LLM agent summarize the results
     
     Returns:
         WebSearchAgentResponse object
@@ -317,20 +444,16 @@ def search_web(
     agent_request = WebSearchAgentRequest(
         search_request=search_request,
         context=context,
-        agent_instructions=agent_instructions
+        agent_instructions=agent_instructions,
+        summarize=summarize
     )
     
-    # Create mock state
-    mock_state: AgentWorkforceState = {
-        "current_web_search_request": agent_request.model_dump()
-    }
-    
-    # Run agent
-    result_state = run_web_search_agent(mock_state)
-    
-    # Extract response
-    response_dict = result_state.get("current_web_search_response", {})
-    return WebSearchAgentResponse(**response_dict)
+    # Run the search directly; no mock state or response re-parsing needed
+    try:
+        return _execute_web_search(agent_request)
+    except Exception as e:
+        logger.exception("Web Search Agent: Error processing search: %s", e)
+        return _web_search_error_response(f"Web Search Agent Processing Error: {str(e)}")
 
 if __name__ == "__main__":
     # Test harness for the Web Search Agent
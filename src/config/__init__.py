@@ -2,6 +2,6 @@
 Configuration package for Salesforce Agent Workforce
 """
 
-from .ai_provider_config import get_llm, get_provider_info, get_all_agent_configs, ai_config
+from .ai_provider_config import get_llm, get_provider_info, get_all_agent_configs, build_system_message, ai_config
 
-__all__ = ['get_llm', 'get_provider_info', 'get_all_agent_configs', 'ai_config'] 
\ No newline at end of file
+__all__ = ['get_llm', 'get_provider_info', 'get_all_agent_configs', 'build_system_message', 'ai_config'] 
\ No newline at end of file
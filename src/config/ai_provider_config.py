@@ -7,36 +7,143 @@ Supports per-agent model configuration for optimal task-specific performance.
 """
 
 import os
+import threading
+from types import MappingProxyType
 from typing import Optional, Dict, Any
 from pathlib import Path
 from dotenv import load_dotenv
 from langchain_core.language_models import BaseLanguageModel
+from langchain_core.messages import SystemMessage
 
 # Load environment variables
 dotenv_path = Path(__file__).resolve().parent.parent.parent / ".env"
 load_dotenv(dotenv_path=dotenv_path)
 
+# Agent names with their own {AGENT_NAME}_{CONFIG_KEY} overrides
+AGENT_NAMES = (
+    "AUTHENTICATION",
+    "FLOW_BUILDER",
+    "DEPLOYMENT",
+    "WEB_SEARCH",
+    "TEST_DESIGNER",
+    "FLOW_VALIDATION",
+    "TEST_EXECUTOR",
+    "FLOW_TEST"
+)
+
+# Settings that can be overridden per agent
+AGENT_CONFIG_KEYS = ("AI_PROVIDER", "MODEL_NAME", "MAX_TOKENS", "ANTHROPIC_API_KEY", "GEMINI_API_KEY")
+
 
 class AIProviderConfig:
     """Configuration class for AI providers with per-agent support"""
     
+    # Fixed attribute set: no per-instance __dict__, faster lookups on the config hot path
+    __slots__ = (
+        "default_ai_provider",
+        "default_model_name",
+        "default_max_tokens",
+        "_env",
+        "_env_lock",
+        "_key_table",
+        "_agent_for_env_name",
+        "_llm_cache",
+        "_anthropic_rate_limiter",
+        "_response_cache"
+    )
+    
+    # Default model per provider, shared read-only across calls
+    _DEFAULT_MODELS = MappingProxyType({
+        "anthropic": "claude-3-5-sonnet-20241022",
+        "gemini": "gemini-pro"
+    })
+    
     def __init__(self):
+        # Agent-specific env var names, built once rather than formatted per lookup
+        self._key_table = {
+            (agent_name, config_key): f"{agent_name}_{config_key}"
+            for agent_name in AGENT_NAMES
+            for config_key in AGENT_CONFIG_KEYS
+        }
+        # Reverse lookup used to detect agent-specific settings in one pass over the environment
+        self._agent_for_env_name = {
+            env_name: agent_name for (agent_name, _), env_name in self._key_table.items()
+        }
+        self._env_lock = threading.Lock()
+        # LLM instances keyed by resolved configuration, so repeated get_llm calls
+        # share one client (and its HTTP connection pool)
+        self._llm_cache: Dict[tuple, BaseLanguageModel] = {}
+        self._load_env()
+    
+    def _load_env(self):
+        """Snapshot the environment and derive the global defaults from it."""
+        # Lookups go through this snapshot instead of os.environ on every call
+        self._env = dict(os.environ)
+        
         # Global defaults
-        self.default_ai_provider = os.getenv("AI_PROVIDER", "anthropic").lower()
-        self.default_model_name = os.getenv("MODEL_NAME", self._get_default_model_for_provider(self.default_ai_provider))
-        self.default_max_tokens = int(os.getenv("MAX_TOKENS", "4096"))
+        self.default_ai_provider = self._env.get("AI_PROVIDER", "anthropic").lower()
+        self.default_model_name = self._env.get("MODEL_NAME", self._get_default_model_for_provider(self.default_ai_provider))
+        self.default_max_tokens = int(self._env.get("MAX_TOKENS", "4096"))
         
         # Validate default AI_PROVIDER value
         if self.default_ai_provider not in ["anthropic", "gemini"]:
             raise ValueError(f"Unsupported AI_PROVIDER: {self.default_ai_provider}. Supported values: 'anthropic', 'gemini'")
+        
+        # Optional client-side throttle shared by every Anthropic instance, so concurrent
+        # workflow runs stay under the account's requests-per-minute quota
+        self._anthropic_rate_limiter = self._build_rate_limiter(self._env.get("ANTHROPIC_REQUESTS_PER_MINUTE"))
+        
+        # Optional exact-match response cache: an identical prompt (same model and
+        # settings) is answered from disk instead of paying for the LLM call again.
+        # Only deterministic (temperature 0) instances use it; see _cache_for
+        self._response_cache = self._build_response_cache(self._env.get("LLM_CACHE_PATH"))
+    
+    @staticmethod
+    def _build_rate_limiter(requests_per_minute: Optional[str]):
+        """Build a token-bucket rate limiter for the given RPM setting, or None if unset."""
+        if not requests_per_minute:
+            return None
+        rpm = float(requests_per_minute)
+        if rpm <= 0:
+            return None
+        from langchain_core.rate_limiters import InMemoryRateLimiter
+        return InMemoryRateLimiter(
+            requests_per_second=rpm / 60,
+            check_every_n_seconds=0.1,
+            max_bucket_size=max(1, int(rpm // 60))
+        )
+    
+    @staticmethod
+    def _build_response_cache(database_path: Optional[str]):
+        """Build a SQLite-backed LLM response cache at the given path, or None if unset."""
+        if not database_path:
+            return None
+        try:
+            from langchain_community.cache import SQLiteCache
+        except ImportError:
+            raise ImportError("langchain-community is required for LLM_CACHE_PATH. Install it with: pip install langchain-community")
+        return SQLiteCache(database_path=database_path)
+    
+    def _cache_for(self, temperature: float):
+        """
+        Response cache for an LLM at the given temperature. Sampled (temperature > 0)
+        instances such as the Flow Builder bypass the cache, so a retry is never pinned
+        to a previously returned - possibly failed - generation.
+        """
+        if temperature > 0:
+            return False
+        return self._response_cache
+    
+    def refresh_env(self):
+        """Re-read environment variables, e.g. after loading another .env file."""
+        with self._env_lock:
+            self._load_env()
+            # Cached instances may have been built from outdated settings
+            self._llm_cache.clear()
     
     def _get_default_model_for_provider(self, provider: str) -> str:
         """Get default model name for a provider"""
-        defaults = {
-            "anthropic": "claude-3-5-sonnet-20241022",
-            "gemini": "gemini-pro"
-        }
-        return defaults.get(provider, "claude-3-5-sonnet-20241022")
+        return self._DEFAULT_MODELS.get(provider, "claude-3-5-sonnet-20241022")
     
     def get_llm(
         self, 
@@ -65,12 +172,20 @@ class AIProviderConfig:
         if max_tokens is None:
             max_tokens = int(self._get_agent_config(agent_name, "MAX_TOKENS", self.default_max_tokens))
             
+        cache_key = (agent_name, ai_provider, model_name, temperature, max_tokens)
+        llm = self._llm_cache.get(cache_key)
+        if llm is not None:
+            return llm
+            
         if ai_provider == "anthropic":
-            return self._get_anthropic_llm(agent_name, model_name, temperature, max_tokens)
+            llm = self._get_anthropic_llm(agent_name, model_name, temperature, max_tokens)
         elif ai_provider == "gemini":
-            return self._get_gemini_llm(agent_name, model_name, temperature, max_tokens)
+            llm = self._get_gemini_llm(agent_name, model_name, temperature, max_tokens)
         else:
             raise ValueError(f"Unsupported AI provider for {agent_name or 'global'}: {ai_provider}")
+        
+        self._llm_cache[cache_key] = llm
+        return llm
     
     def _get_agent_config(self, agent_name: Optional[str], config_key: str, default_value: Any) -> Any:
         """
@@ -80,13 +195,16 @@ class AIProviderConfig:
         Example: FLOW_BUILDER_AI_PROVIDER, AUTHENTICATION_MODEL_NAME, TEST_DESIGNER_MAX_TOKENS
         """
         if agent_name:
-            agent_specific_key = f"{agent_name.upper()}_{config_key}"
-            agent_value = os.getenv(agent_specific_key)
+            agent_specific_key = (
+                self._key_table.get((agent_name, config_key))
+                or f"{agent_name.upper()}_{config_key}"
+            )
+            agent_value = self._env.get(agent_specific_key)
             if agent_value is not None:
                 return agent_value
         
         # Fall back to global config
-        return os.getenv(config_key, default_value)
+        return self._env.get(config_key, default_value)
     
     def _get_anthropic_llm(self, agent_name: Optional[str], model_name: str, temperature: float, max_tokens: int) -> BaseLanguageModel:
         """Get Anthropic LLM instance with agent-specific configuration"""
@@ -98,7 +216,7 @@ class AIProviderConfig:
         # Check for agent-specific API key first, then global
         api_key = self._get_agent_config(agent_name, "ANTHROPIC_API_KEY", None)
         if not api_key:
-            api_key = os.getenv("ANTHROPIC_API_KEY")
+            api_key = self._env.get("ANTHROPIC_API_KEY")
         if not api_key:
             raise ValueError(f"ANTHROPIC_API_KEY not found for {agent_name or 'global'} configuration.")
         
@@ -106,7 +224,9 @@ class AIProviderConfig:
             model=model_name,
             temperature=temperature,
             max_tokens=max_tokens,
-            anthropic_api_key=api_key
+            anthropic_api_key=api_key,
+            rate_limiter=self._anthropic_rate_limiter,
+            cache=self._cache_for(temperature)
         )
     
     def _get_gemini_llm(self, agent_name: Optional[str], model_name: str, temperature: float, max_tokens: int) -> BaseLanguageModel:
@@ -119,7 +239,7 @@ class AIProviderConfig:
         # Check for agent-specific API key first, then global
         api_key = self._get_agent_config(agent_name, "GEMINI_API_KEY", None)
         if not api_key:
-            api_key = os.getenv("GEMINI_API_KEY")
+            api_key = self._env.get("GEMINI_API_KEY")
         if not api_key:
             raise ValueError(f"GEMINI_API_KEY not found for {agent_name or 'global'} configuration.")
         
@@ -127,7 +247,8 @@ class AIProviderConfig:
             model=model_name,
             temperature=temperature,
             max_output_tokens=max_tokens,
-            google_api_key=api_key
+            google_api_key=api_key,
+            cache=self._cache_for(temperature)
         )
     
     def get_provider_info(self, agent_name: Optional[str] = None) -> dict:
@@ -140,12 +261,12 @@ class AIProviderConfig:
         if ai_provider == "anthropic":
             api_key_set = bool(
                 self._get_agent_config(agent_name, "ANTHROPIC_API_KEY", None) or 
-                os.getenv("ANTHROPIC_API_KEY")
+                self._env.get("ANTHROPIC_API_KEY")
             )
         elif ai_provider == "gemini":
             api_key_set = bool(
                 self._get_agent_config(agent_name, "GEMINI_API_KEY", None) or 
-                os.getenv("GEMINI_API_KEY")
+                self._env.get("GEMINI_API_KEY")
             )
         else:
             api_key_set = False
@@ -162,29 +283,15 @@ class AIProviderConfig:
         """Get configuration information for all detected agent configurations"""
         configs = {"global": self.get_provider_info()}
         
-        # Common agent names to check for specific configurations
-        agent_names = [
-            "AUTHENTICATION",
-            "FLOW_BUILDER", 
-            "DEPLOYMENT",
-            "WEB_SEARCH",
-            "TEST_DESIGNER",
-            "FLOW_VALIDATION",
-            "TEST_EXECUTOR",
-            "FLOW_TEST"
-        ]
-        
-        for agent_name in agent_names:
-            # Check if agent has any specific configuration
-            has_specific_config = any([
-                os.getenv(f"{agent_name}_AI_PROVIDER"),
-                os.getenv(f"{agent_name}_MODEL_NAME"),
-                os.getenv(f"{agent_name}_MAX_TOKENS"),
-                os.getenv(f"{agent_name}_ANTHROPIC_API_KEY"),
-                os.getenv(f"{agent_name}_GEMINI_API_KEY")
-            ])
-            
-            if has_specific_config:
+        # Find agents with any specific configuration in a single sweep of the environment
+        configured_agents = {
+            self._agent_for_env_name[env_name]
+            for env_name, value in self._env.items()
+            if value and env_name in self._agent_for_env_name
+        }
+        
+        for agent_name in AGENT_NAMES:
+            if agent_name in configured_agents:
                 configs[agent_name.lower()] = self.get_provider_info(agent_name)
         
         return configs
@@ -221,6 +328,28 @@ def get_llm(
     return ai_config.get_llm(agent_name=agent_name, temperature=temperature, max_tokens=max_tokens)
 
 
+def build_system_message(llm: BaseLanguageModel, content: str) -> SystemMessage:
+    """
+    Build a system message, marking it for prompt caching when the LLM supports it.
+    
+    Anthropic caches a prompt prefix that ends in a block with cache_control, so a
+    large, unchanging system prompt is billed and processed at the cached rate on
+    every call after the first. Other providers get a plain system message.
+    
+    Args:
+        llm: The LLM instance the message will be sent to
+        content: System prompt text; should not vary between calls
+        
+    Returns:
+        SystemMessage for the given LLM
+    """
+    if getattr(llm, "_llm_type", None) == "anthropic-chat":
+        return SystemMessage(content=[
+            {"type": "text", "text": content, "cache_control": {"type": "ephemeral"}}
+        ])
+    return SystemMessage(content=content)
+
+
 def get_provider_info(agent_name: Optional[str] = None) -> dict:
     """
     Convenience function to get provider information for a specific agent.
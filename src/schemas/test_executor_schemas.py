@@ -61,7 +61,7 @@ class TestExecutorResponse(BaseModel):
     """Response from test execution"""
     request_id: str = Field(description="Unique identifier matching the request")
     success: bool = Field(description="Whether the test execution completed successfully")
-    request: TestExecutorRequest = Field(description="Original request for reference")
+    request: Optional[TestExecutorRequest] = Field(default=None, description="Original request for reference; None when the request could not be processed")
     
     # Test execution results
     test_run_summary: Optional[TestRunSummary] = Field(default=None, description="Summary of test execution")
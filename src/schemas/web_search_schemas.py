@@ -42,6 +42,7 @@ class WebSearchAgentRequest(BaseModel):
     search_request: WebSearchRequest = Field(description="The web search request to process")
     context: Optional[str] = Field(default=None, description="Additional context for the search agent")
     agent_instructions: Optional[str] = Field(default=None, description="Specific instructions for the search agent")
+    summarize: bool = Field(default=True, description="Whether to run the LLM agent to write a summary; if False, only the direct search runs")
 
 class WebSearchAgentResponse(BaseModel):
     """Response from the Web Search Agent."""
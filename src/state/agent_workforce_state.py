@@ -7,6 +7,7 @@ class AgentWorkforceState(TypedDict, total=False):
     """State for the Agent Workforce LangGraph workflow"""
     
     # Authentication related state
+    org_alias: Optional[str]  # Org alias of this run, kept after current_auth_request is cleared
     current_auth_request: Optional[Dict[str, Any]]  # Serialized SalesforceAuthRequest
     current_auth_response: Optional[Dict[str, Any]]  # Serialized SalesforceAuthResponse
     is_authenticated: bool
@@ -15,14 +16,16 @@ class AgentWorkforceState(TypedDict, total=False):
     # Flow Building related state
     current_flow_build_request: Optional[Dict[str, Any]]  # Serialized FlowBuildRequest
     current_flow_build_response: Optional[Dict[str, Any]]  # Serialized FlowBuildResponse
+    flow_build_success: bool  # Whether current_flow_build_response succeeded, for routing
     flow_builder_memory_data: Optional[Dict[str, Any]]  # Persistent memory data for enhanced flow builder
 
     # User requirements
     user_story: Optional[Dict[str, Any]]  # Serialized UserStory with acceptance criteria
 
     # Deployment related state
-    current_deployment_request: Optional[Dict[str, Any]]  # Serialized DeploymentRequest
+    current_deployment_request: Optional[Any]  # DeploymentRequest model, or its serialized dict
     current_deployment_response: Optional[Dict[str, Any]]  # Serialized DeploymentResponse
+    deployment_success: bool  # Whether current_deployment_response succeeded, for routing
     
     # TestDesigner related state
     current_test_designer_request: Optional[Dict[str, Any]]  # Serialized TestDesignerRequest
@@ -36,20 +39,22 @@ class AgentWorkforceState(TypedDict, total=False):
     current_test_deployment_response: Optional[Dict[str, Any]]  # Serialized DeploymentResponse for test classes
     
     # TestExecutor related state
-    current_test_executor_request: Optional[Dict[str, Any]]  # Serialized TestExecutorRequest
+    current_test_executor_request: Optional[Any]  # Serialized TestExecutorRequest, or the model itself
     current_test_executor_response: Optional[Dict[str, Any]]  # Serialized TestExecutorResponse
     test_execution_results: Optional[List[Dict[str, Any]]]  # Serialized TestResult objects
     code_coverage_results: Optional[List[Dict[str, Any]]]  # Serialized CodeCoverageResult objects
     test_execution_summary: Optional[Dict[str, Any]]  # Serialized TestRunSummary
     
     # Web Search related state
-    current_web_search_request: Optional[Dict[str, Any]]  # Serialized WebSearchAgentRequest
+    current_web_search_request: Optional[Any]  # Serialized WebSearchAgentRequest, or the model itself
     current_web_search_response: Optional[Dict[str, Any]]  # Serialized WebSearchAgentResponse
     
     # Simple Retry Management
     build_deploy_retry_count: int  # Current retry attempt for build/deploy cycle
     max_build_deploy_retries: int  # Maximum allowed retries from environment
     test_deploy_retry_count: int  # Current retry attempt for test deployment cycle
+    failed_flow_xml_hashes: Optional[List[str]]  # Digests of Flow XML that Salesforce rejected in this run
+    flow_xml_unchanged: bool  # The latest Flow XML repeats one already rejected, so deployment was skipped
     
     # Test Class Regeneration Support
     test_class_regeneration_retry: bool  # Flag indicating this is a test regeneration retry
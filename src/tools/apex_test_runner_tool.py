@@ -10,14 +10,18 @@ This tool handles:
 Note: This tool assumes test classes are already deployed by the DeploymentAgent.
 """
 
+import asyncio
 import time
 import json
 import subprocess
 import tempfile
+import threading
 import os
-from typing import Type, List, Dict, Any, Optional
+from typing import Type, List, Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
 
+import requests
+from requests.adapters import HTTPAdapter
 from langchain_core.tools import BaseTool
 from pydantic import BaseModel, Field
 from simple_salesforce import Salesforce
@@ -29,6 +33,27 @@ from src.schemas.test_executor_schemas import (
 )
 from src.schemas.auth_schemas import SalesforceAuthResponse
 
+# Seconds to wait between AsyncApexJob status polls
+POLL_INTERVAL_SECONDS = 10
+
+# Salesforce API connections keyed by (session_id, instance_url), shared across tool instances
+MAX_CACHED_CONNECTIONS = 8
+_sf_connections: Dict[Tuple[str, str], Salesforce] = {}
+_sf_connections_lock = threading.Lock()
+
+def _create_http_session() -> requests.Session:
+    """
+    One pooled HTTP session for every Salesforce connection the tool opens.
+    simple-salesforce sends auth headers per request, so connections for different
+    sessions can safely share it and reuse the same keep-alive sockets.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+    session.mount("https://", adapter)
+    return session
+
+_http_session = _create_http_session()
+
 
 class ApexTestRunnerTool(BaseTool):
     """Tool for executing already-deployed Apex tests in Salesforce"""
@@ -50,22 +75,7 @@ class ApexTestRunnerTool(BaseTool):
         start_time = time.time()
         
         try:
-            # Handle different input formats
-            if 'full_request' in kwargs and kwargs['full_request']:
-                # Use the full request if provided
-                request_data = kwargs['full_request']
-                if isinstance(request_data, dict):
-                    request = TestExecutorRequest(**request_data)
-                else:
-                    request = request_data
-            else:
-                # Build request from individual parameters
-                request = TestExecutorRequest(**kwargs)
-            
-            print(f"🧪 Starting test execution for {len(request.test_class_names)} test classes...")
-            print(f"📋 Request ID: {request.request_id}")
-            print(f"🏢 Org Alias: {request.org_alias}")
-            print(f"🎯 Coverage Target: {request.coverage_target}%")
+            request = self._parse_request(kwargs)
             
             # Step 1: Verify we have a valid Salesforce session
             self._verify_salesforce_session(request)
@@ -82,35 +92,59 @@ class ApexTestRunnerTool(BaseTool):
             )
             
         except Exception as e:
-            error_msg = f"Test execution failed with error: {str(e)}"
-            print(f"❌ {error_msg}")
-            
-            # Try to extract request_id from kwargs
-            request_id = kwargs.get('request_id', 'unknown')
-            if 'full_request' in kwargs and kwargs['full_request']:
-                request_data = kwargs['full_request']
-                if isinstance(request_data, dict):
-                    request_id = request_data.get('request_id', 'unknown')
-            
-            return TestExecutorResponse(
+            return self._create_error_response(kwargs, e, start_time)
+
+    def _parse_request(self, kwargs: Dict[str, Any]) -> TestExecutorRequest:
+        """Build a TestExecutorRequest from either a full request or individual parameters"""
+        if 'full_request' in kwargs and kwargs['full_request']:
+            # Use the full request if provided
+            request_data = kwargs['full_request']
+            if isinstance(request_data, dict):
+                request = TestExecutorRequest(**request_data)
+            else:
+                request = request_data
+        else:
+            # Build request from individual parameters
+            request = TestExecutorRequest(**kwargs)
+        
+        print(f"🧪 Starting test execution for {len(request.test_class_names)} test classes...")
+        print(f"📋 Request ID: {request.request_id}")
+        print(f"🏢 Org Alias: {request.org_alias}")
+        print(f"🎯 Coverage Target: {request.coverage_target}%")
+        
+        return request
+
+    def _create_error_response(self, kwargs: Dict[str, Any], error: Exception, start_time: float) -> TestExecutorResponse:
+        """Create a failed TestExecutorResponse for an execution error"""
+        error_msg = f"Test execution failed with error: {str(error)}"
+        print(f"❌ {error_msg}")
+        
+        # Try to extract request_id from kwargs
+        request_id = kwargs.get('request_id', 'unknown')
+        if 'full_request' in kwargs and kwargs['full_request']:
+            request_data = kwargs['full_request']
+            if isinstance(request_data, dict):
+                request_id = request_data.get('request_id', 'unknown')
+        
+        return TestExecutorResponse(
+            request_id=request_id,
+            success=False,
+            request=TestExecutorRequest(
                 request_id=request_id,
-                success=False,
-                request=TestExecutorRequest(
-                    request_id=request_id,
-                    salesforce_session=SalesforceAuthResponse(
-                        success=False,
-                        session_id="",
-                        instance_url="",
-                        user_id="unknown",
-                        org_id="unknown",
-                        auth_type_used="unknown"
-                    ),
-                    test_class_names=[],
-                    org_alias="unknown"
+                salesforce_session=SalesforceAuthResponse(
+                    success=False,
+                    session_id="",
+                    instance_url="",
+                    user_id="unknown",
+                    org_id="unknown",
+                    auth_type_used="unknown"
                 ),
-                error_message=error_msg,
-                execution_time_seconds=time.time() - start_time
-            )
+                test_class_names=[],
+                org_alias="unknown"
+            ),
+            error_message=error_msg,
+            execution_time_seconds=time.time() - start_time
+        )
 
     def _verify_salesforce_session(self, request: TestExecutorRequest):
         """Verify that we have a valid Salesforce session"""
@@ -453,40 +487,8 @@ class ApexTestRunnerTool(BaseTool):
         print("🔄 Executing Apex tests with Salesforce API...")
         
         try:
-            # Initialize Salesforce connection
-            sf_session = request.salesforce_session
-            instance_url = sf_session.instance_url
-            if not instance_url.startswith('https://'):
-                instance_url = f"https://{instance_url}"
-            
-            sf = Salesforce(session_id=sf_session.session_id, instance_url=instance_url)
-            
-            # Verify test classes exist
-            self._verify_test_classes_exist_api(sf, request.test_class_names)
-            
-            # Get class IDs for the test classes
-            class_ids = self._get_test_class_ids(sf, request.test_class_names)
-            
-            # Queue test execution for all test classes
-            test_request_data = {
-                "tests": [{"classId": class_id} for class_id in class_ids],
-                "maxFailedTests": 100  # Allow up to 100 failures before stopping
-            }
-            
-            # Use Tooling API to queue tests
-            tooling_url = f"{instance_url}/services/data/v59.0/tooling/runTestsAsynchronous/"
-            
-            response = sf.session.post(
-                tooling_url,
-                headers={'Content-Type': 'application/json'},
-                data=json.dumps(test_request_data)
-            )
-            
-            if response.status_code != 200:
-                raise Exception(f"Failed to queue tests: {response.text}")
-            
-            test_run_id = response.json()
-            print(f"✅ Tests queued with ID: {test_run_id}")
+            sf = self._connect_api(request)
+            test_run_id = self._submit_tests_api(sf, request)
             
             # Poll for test completion
             return self._poll_test_results(sf, test_run_id, request.timeout_minutes)
@@ -495,17 +497,80 @@ class ApexTestRunnerTool(BaseTool):
             print(f"❌ Error executing tests with API: {str(e)}")
             raise
 
+    def _connect_api(self, request: TestExecutorRequest) -> Salesforce:
+        """
+        Get a Salesforce API connection for the request's session.
+        Connections are reused per session so their HTTP keep-alive pool stays warm
+        across the verify, queue, poll and coverage calls of a run.
+        """
+        sf_session = request.salesforce_session
+        instance_url = sf_session.instance_url
+        if not instance_url.startswith('https://'):
+            instance_url = f"https://{instance_url}"
+        
+        key = (sf_session.session_id, instance_url)
+        with _sf_connections_lock:
+            sf = _sf_connections.get(key)
+            if sf is None:
+                sf = Salesforce(
+                    session_id=sf_session.session_id,
+                    instance_url=instance_url,
+                    session=_http_session
+                )
+                _sf_connections[key] = sf
+                # Sessions rarely change; drop the oldest once a handful accumulate
+                while len(_sf_connections) > MAX_CACHED_CONNECTIONS:
+                    _sf_connections.pop(next(iter(_sf_connections)))
+        return sf
+
+    def _submit_tests_api(self, sf: Salesforce, request: TestExecutorRequest) -> str:
+        """Queue the test classes via the Tooling API and return the AsyncApexJob ID without waiting"""
+        # Verify test classes exist
+        self._verify_test_classes_exist_api(sf, request.test_class_names)
+        
+        # Get class IDs for the test classes
+        class_ids = self._get_test_class_ids(sf, request.test_class_names)
+        
+        # Queue test execution for all test classes
+        test_request_data = {
+            "tests": [{"classId": class_id} for class_id in class_ids],
+            "maxFailedTests": 100  # Allow up to 100 failures before stopping
+        }
+        
+        # Use Tooling API to queue tests
+        tooling_url = f"https://{sf.sf_instance}/services/data/v59.0/tooling/runTestsAsynchronous/"
+        
+        response = sf.session.post(
+            tooling_url,
+            headers={'Content-Type': 'application/json'},
+            data=json.dumps(test_request_data)
+        )
+        
+        if response.status_code != 200:
+            raise Exception(f"Failed to queue tests: {response.text}")
+        
+        test_run_id = response.json()
+        print(f"✅ Tests queued with ID: {test_run_id}")
+        return test_run_id
+
+    async def _aexecute_tests_with_api(self, request: TestExecutorRequest) -> List[TestResult]:
+        """Queue tests via the API and await completion without blocking the event loop"""
+        print("🔄 Executing Apex tests with Salesforce API (async)...")
+        
+        try:
+            sf = await asyncio.to_thread(self._connect_api, request)
+            test_run_id = await asyncio.to_thread(self._submit_tests_api, sf, request)
+            return await self._apoll_test_results(sf, test_run_id, request.timeout_minutes)
+        except Exception as e:
+            print(f"❌ Error executing tests with API: {str(e)}")
+            raise
+
     def _verify_test_classes_exist(self, request: TestExecutorRequest):
         """Verify that the test classes exist in the target org"""
         print("🔍 Verifying test classes exist in target org...")
         
         try:
-            sf_session = request.salesforce_session
-            instance_url = sf_session.instance_url
-            if not instance_url.startswith('https://'):
-                instance_url = f"https://{instance_url}"
-            
-            sf = Salesforce(session_id=sf_session.session_id, instance_url=instance_url)
+            sf = self._connect_api(request)
             
             # Query for the test classes
             class_names_str = "', '".join(request.test_class_names)
@@ -572,65 +637,98 @@ class ApexTestRunnerTool(BaseTool):
         print(f"🔗 Test run ID: {test_run_id}")
         
         timeout_time = datetime.now() + timedelta(minutes=timeout_minutes)
-        polling_interval = 10  # Poll every 10 seconds
         poll_count = 0
         
         while datetime.now() < timeout_time:
+            poll_count += 1
             try:
-                poll_count += 1
-                # Query test run status
-                query = f"SELECT Id, Status, JobName, StartTime, EndTime, CompletedDate FROM AsyncApexJob WHERE Id = '{test_run_id}'"
-                job_result = sf.query(query)
+                test_results = self._check_test_run(sf, test_run_id, poll_count)
+                if test_results is not None:
+                    return test_results
                 
-                if job_result['totalSize'] == 0:
-                    raise Exception(f"Test run {test_run_id} not found")
-                
-                job = job_result['records'][0]
-                status = job['Status']
-                start_time = job.get('StartTime')
-                completed_date = job.get('CompletedDate')
-                job_name = job.get('JobName', 'Unknown')
-                
-                # Provide detailed polling status
-                print(f"📊 Poll #{poll_count}: Test run status: {status}")
-                if start_time:
-                    print(f"   ⏰ Started: {start_time}")
-                if completed_date:
-                    print(f"   ✅ Completed: {completed_date}")
-                print(f"   📋 Job: {job_name}")
-                
-                if status in ['Completed', 'Failed', 'Aborted']:
-                    # Test execution completed, retrieve detailed results
-                    print(f"🎯 Test execution finished with status: {status}")
-                    if status == 'Completed':
-                        print("✅ Retrieving test results...")
-                    elif status == 'Failed':
-                        print("❌ Test run failed - retrieving available results...")
-                    elif status == 'Aborted':
-                        print("⚠️ Test run was aborted - retrieving partial results...")
-                    
-                    return self._retrieve_test_results(sf, test_run_id)
+                # Wait before next poll
+                print(f"   💤 Waiting {POLL_INTERVAL_SECONDS} seconds before next poll...")
                 
-                # Still running, provide progress info
-                if status == 'Processing':
-                    print(f"   🔄 Test execution in progress...")
-                elif status == 'Queued':
-                    print(f"   ⏳ Test execution queued, waiting for resources...")
-                elif status == 'Preparing':
-                    print(f"   🔧 Preparing test execution environment...")
+            except Exception as e:
+                print(f"⚠️ Error polling test results (attempt {poll_count}): {str(e)}")
+                print(f"   🔄 Retrying in {POLL_INTERVAL_SECONDS} seconds...")
+            
+            time.sleep(POLL_INTERVAL_SECONDS)
+        
+        # Timeout reached
+        raise Exception(f"Test execution timed out after {timeout_minutes} minutes ({poll_count} polls)")
+
+    async def _apoll_test_results(self, sf: Salesforce, test_run_id: str, timeout_minutes: int) -> List[TestResult]:
+        """Async version of _poll_test_results - sleeps between polls without blocking the event loop"""
+        print(f"⏳ Polling for test results (timeout: {timeout_minutes} minutes)...")
+        print(f"🔗 Test run ID: {test_run_id}")
+        
+        timeout_time = datetime.now() + timedelta(minutes=timeout_minutes)
+        poll_count = 0
+        
+        while datetime.now() < timeout_time:
+            poll_count += 1
+            try:
+                test_results = await asyncio.to_thread(self._check_test_run, sf, test_run_id, poll_count)
+                if test_results is not None:
+                    return test_results
                 
-                # Wait before next poll
-                print(f"   💤 Waiting {polling_interval} seconds before next poll...")
-                time.sleep(polling_interval)
+                print(f"   💤 Waiting {POLL_INTERVAL_SECONDS} seconds before next poll...")
                 
             except Exception as e:
                 print(f"⚠️ Error polling test results (attempt {poll_count}): {str(e)}")
-                print(f"   🔄 Retrying in {polling_interval} seconds...")
-                time.sleep(polling_interval)
+                print(f"   🔄 Retrying in {POLL_INTERVAL_SECONDS} seconds...")
+            
+            await asyncio.sleep(POLL_INTERVAL_SECONDS)
         
         # Timeout reached
         raise Exception(f"Test execution timed out after {timeout_minutes} minutes ({poll_count} polls)")
 
+    def _check_test_run(self, sf: Salesforce, test_run_id: str, poll_count: int) -> Optional[List[TestResult]]:
+        """Query the test run once; return its results if finished, None if still running"""
+        # Query test run status
+        query = f"SELECT Id, Status, JobName, StartTime, EndTime, CompletedDate FROM AsyncApexJob WHERE Id = '{test_run_id}'"
+        job_result = sf.query(query)
+        
+        if job_result['totalSize'] == 0:
+            raise Exception(f"Test run {test_run_id} not found")
+        
+        job = job_result['records'][0]
+        status = job['Status']
+        start_time = job.get('StartTime')
+        completed_date = job.get('CompletedDate')
+        job_name = job.get('JobName', 'Unknown')
+        
+        # Provide detailed polling status
+        print(f"📊 Poll #{poll_count}: Test run status: {status}")
+        if start_time:
+            print(f"   ⏰ Started: {start_time}")
+        if completed_date:
+            print(f"   ✅ Completed: {completed_date}")
+        print(f"   📋 Job: {job_name}")
+        
+        if status in ['Completed', 'Failed', 'Aborted']:
+            # Test execution completed, retrieve detailed results
+            print(f"🎯 Test execution finished with status: {status}")
+            if status == 'Completed':
+                print("✅ Retrieving test results...")
+            elif status == 'Failed':
+                print("❌ Test run failed - retrieving available results...")
+            elif status == 'Aborted':
+                print("⚠️ Test run was aborted - retrieving partial results...")
+            
+            return self._retrieve_test_results(sf, test_run_id)
+        
+        # Still running, provide progress info
+        if status == 'Processing':
+            print(f"   🔄 Test execution in progress...")
+        elif status == 'Queued':
+            print(f"   ⏳ Test execution queued, waiting for resources...")
+        elif status == 'Preparing':
+            print(f"   🔧 Preparing test execution environment...")
+        
+        return None
+
     def _retrieve_test_results(self, sf: Salesforce, test_run_id: str) -> List[TestResult]:
         """Retrieve detailed test results from Salesforce"""
         print("📋 Retrieving detailed test results...")
@@ -703,12 +801,7 @@ class ApexTestRunnerTool(BaseTool):
         print("📈 Retrieving code coverage information...")
         
         try:
-            sf_session = request.salesforce_session
-            instance_url = sf_session.instance_url
-            if not instance_url.startswith('https://'):
-                instance_url = f"https://{instance_url}"
-            
-            sf = Salesforce(session_id=sf_session.session_id, instance_url=instance_url)
+            sf = self._connect_api(request)
             
             # Query code coverage for all classes
             query = """
@@ -862,6 +955,40 @@ class ApexTestRunnerTool(BaseTool):
         
         return warnings
 
-    async def _arun(self, request: TestExecutorRequest) -> TestExecutorResponse:
-        """Async version - delegate to sync implementation"""
-        return self._run(request) 
\ No newline at end of file
+    async def _arun(self, **kwargs) -> TestExecutorResponse:
+        """
+        Async version of _run. Tests are queued and then awaited with non-blocking polling,
+        so the event loop stays free while Salesforce runs them.
+        """
+        start_time = time.time()
+        
+        try:
+            request = self._parse_request(kwargs)
+            self._verify_salesforce_session(request)
+            
+            test_results = await self._aexecute_tests_with_fallback(request)
+            coverage_results = await asyncio.to_thread(self._get_code_coverage, request)
+            
+            return self._create_response(
+                request, test_results, coverage_results, start_time
+            )
+            
+        except Exception as e:
+            return self._create_error_response(kwargs, e, start_time)
+
+    async def _aexecute_tests_with_fallback(self, request: TestExecutorRequest) -> List[TestResult]:
+        """Async version of _execute_tests_with_fallback"""
+        print("🔄 Executing Apex tests with dynamic CLI approach...")
+        
+        # The CLI blocks until the run finishes, so keep it off the event loop
+        if await asyncio.to_thread(self._is_sfdx_available):
+            try:
+                print(f"🚀 Attempting test execution with Salesforce CLI")
+                return await asyncio.to_thread(self._execute_tests_with_cli_dynamic, request)
+            except Exception as e:
+                print(f"⚠️ CLI execution failed: {str(e)}")
+                print("🔄 Falling back to Salesforce API approach...")
+        else:
+            print("⚠️ sfdx not available, using Salesforce API approach")
+        
+        return await self._aexecute_tests_with_api(request) 
\ No newline at end of file
@@ -1,3 +1,4 @@
+import asyncio
 import base64
 import io
 import time
@@ -85,6 +86,11 @@ METADATA_TYPE_CONFIG = {
     }
 }
 
+# Deployment status polling: up to 5 minutes (60 attempts * 5 seconds)
+DEPLOY_POLL_INTERVAL_SECONDS = 5
+DEPLOY_POLL_MAX_ATTEMPTS = 60
+DEPLOY_FINAL_STATES = frozenset({'Succeeded', 'Failed', 'Canceled', 'SucceededPartial'})
+
 class SalesforceDeployerTool(BaseTool):
     name: str = "salesforce_deployer_tool"
     description: str = (
@@ -166,6 +172,171 @@ class SalesforceDeployerTool(BaseTool):
     <status>Active</status>
 </ApexClass>"""
 
+    def _connect(self, request: DeploymentRequest) -> Salesforce:
+        """Open a simple-salesforce client on the request's session."""
+        sf_session: SalesforceAuthResponse = request.salesforce_session
+
+        # Ensure instance URL has proper protocol
+        instance_url = sf_session.instance_url
+        if instance_url and not instance_url.startswith('https://'):
+            instance_url = f"https://{instance_url}"
+
+        return Salesforce(session_id=sf_session.session_id, instance_url=instance_url)
+
+    def _submit_deployment(self, sf: Salesforce, request: DeploymentRequest) -> Optional[str]:
+        """Package the components, submit the deploy and return its async ID."""
+        # Create package.xml and zip file with all components
+        package_xml_content = self._create_package_xml(request.components, request.api_version)
+        zip_bytes = self._create_zip_package(request.components, package_xml_content)
+
+        # Create a temporary file to store the zip file
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".zip") as temp_zip_file:
+            temp_zip_file.write(zip_bytes)
+            temp_zip_file_path = temp_zip_file.name
+
+        try:
+            component_types = list(set(comp.component_type for comp in request.components))
+            component_names = [comp.api_name for comp in request.components]
+
+            print(f"Deploying {len(request.components)} components of types {component_types} to {request.salesforce_session.instance_url}...")
+            print(f"Component names: {component_names}")
+
+            # simple-salesforce deploy method expects a file path and sandbox flag;
+            # the zip is read and uploaded before it returns
+            deploy_result_async_id = sf.deploy(temp_zip_file_path, sandbox=False)
+        finally:
+            # Clean up the temporary file
+            try:
+                os.unlink(temp_zip_file_path)
+            except OSError:
+                pass  # Ignore errors if file doesn't exist or can't be deleted
+
+        return deploy_result_async_id.get('asyncId') or deploy_result_async_id.get('id')
+
+    @staticmethod
+    def _final_status(status_info: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Return ``status_info`` if the deployment has finished, otherwise None."""
+        print(f"  Raw status_info: {status_info}")
+
+        # The actual response structure uses 'state' not 'status'
+        state = status_info.get('state', '')
+        print(f"  State: {state}")
+
+        # Check if deployment is complete (success or failure)
+        if state in DEPLOY_FINAL_STATES:
+            return status_info
+        return None
+
+    def _failure_response(self, request: DeploymentRequest, error_message: str,
+                          status: str = "Failed", deployment_id: Optional[str] = None) -> DeploymentResponse:
+        """Build a response for a deployment that produced no component results."""
+        total_components = len(request.components) if request.components else 0
+        return DeploymentResponse(
+            request_id=request.request_id,
+            success=False,
+            status=status,
+            deployment_id=deployment_id,
+            error_message=error_message,
+            total_components=total_components,
+            successful_components=0,
+            failed_components=total_components
+        )
+
+    def _no_deployment_id_response(self, request: DeploymentRequest) -> DeploymentResponse:
+        return self._failure_response(
+            request, "Failed to initiate deployment: No deployment ID received."
+        )
+
+    def _timeout_response(self, request: DeploymentRequest, deployment_id: str) -> DeploymentResponse:
+        return self._failure_response(
+            request,
+            f"Deployment polling timed out after {DEPLOY_POLL_MAX_ATTEMPTS * DEPLOY_POLL_INTERVAL_SECONDS} seconds.",
+            status="InProgress",  # Or "TimedOut"
+            deployment_id=deployment_id
+        )
+
+    def _exception_response(self, request: DeploymentRequest, error: Exception) -> DeploymentResponse:
+        if isinstance(error, SalesforceError):
+            # This exception is raised by simple_salesforce on certain deploy errors
+            return self._failure_response(request, f"Salesforce deployment API error: {str(error)}")
+        # Catch any other unexpected errors during the process
+        return self._failure_response(
+            request, f"An unexpected error occurred in SalesforceDeployerTool: {str(error)}"
+        )
+
+    def _build_deployment_response(self, request: DeploymentRequest, deployment_id: str,
+                                   final_status_info: Dict[str, Any]) -> DeploymentResponse:
+        """Turn the final checkDeployStatus payload into a DeploymentResponse."""
+        # Process final deployment status
+        state = final_status_info.get('state', 'Unknown')
+        deployment_detail = final_status_info.get('deployment_detail', {})
+
+        # Extract component errors from deployment_detail
+        deployment_errors = deployment_detail.get('errors', [])
+
+        # Convert deployment errors to component errors format
+        component_errors = []
+        for error in deployment_errors:
+            # Try to map error to specific component
+            error_file = error.get('file', '')
+            component_name = error.get('fullName', 'Unknown')
+            component_type = error.get('type', 'Unknown')
+
+            # If we can't get component info from error, try to infer from file path
+            if component_name == 'Unknown' and error_file:
+                for comp in request.components:
+                    config = self._get_component_config(comp)
+                    expected_path = f"{config['directory']}/{comp.api_name}.{config['file_extension']}"
+                    if expected_path in error_file:
+                        component_name = comp.api_name
+                        component_type = comp.component_type
+                        break
+
+            component_errors.append({
+                'fullName': component_name,
+                'componentType': component_type,
+                'problem': error.get('message', 'Unknown error'),
+                'fileName': error_file
+            })
+
+        # Extract component successes if available
+        component_successes = []
+        deployment_successes = deployment_detail.get('successes', [])
+        for success in deployment_successes:
+            component_successes.append({
+                'fullName': success.get('fullName', 'Unknown'),
+                'componentType': success.get('type', 'Unknown'),
+                'fileName': success.get('file', '')
+            })
+
+        # Determine success based on state
+        success = state == 'Succeeded'
+
+        # Calculate summary statistics
+        total_components = len(request.components)
+        failed_components = len(component_errors)
+        successful_components = total_components - failed_components
+
+        # Extract error message
+        error_message = None
+        if not success and component_errors:
+            error_message = f"Deployment failed with {len(component_errors)} error(s) out of {total_components} component(s)"
+        elif state == 'SucceededPartial':
+            error_message = f"Deployment partially succeeded: {successful_components} succeeded, {failed_components} failed"
+
+        return DeploymentResponse(
+            request_id=request.request_id,
+            success=success,
+            status=state,
+            deployment_id=deployment_id,
+            error_message=error_message,
+            component_successes=component_successes,
+            component_errors=component_errors,
+            total_components=total_components,
+            successful_components=successful_components,
+            failed_components=failed_components
+        )
+
     def _run(self, request: DeploymentRequest) -> DeploymentResponse:
         """
         Executes the deployment process for multiple metadata components.
@@ -173,184 +344,49 @@ class SalesforceDeployerTool(BaseTool):
         Output is a DeploymentResponse Pydantic model.
         """
         try:
-            sf_session: SalesforceAuthResponse = request.salesforce_session
-            
-            # Ensure instance URL has proper protocol
-            instance_url = sf_session.instance_url
-            if instance_url and not instance_url.startswith('https://'):
-                instance_url = f"https://{instance_url}"
-            
-            sf = Salesforce(session_id=sf_session.session_id, instance_url=instance_url)
+            sf = self._connect(request)
+            deployment_id = self._submit_deployment(sf, request)
+            if not deployment_id:
+                return self._no_deployment_id_response(request)
 
-            # Create package.xml and zip file with all components
-            package_xml_content = self._create_package_xml(request.components, request.api_version)
-            zip_bytes = self._create_zip_package(request.components, package_xml_content)
-            
-            # Create a temporary file to store the zip file
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".zip") as temp_zip_file:
-                temp_zip_file.write(zip_bytes)
-                temp_zip_file_path = temp_zip_file.name
+            print(f"Deployment initiated with ID: {deployment_id}. Polling for status...")
 
-            try:
-                component_types = list(set(comp.component_type for comp in request.components))
-                component_names = [comp.api_name for comp in request.components]
-                
-                print(f"Deploying {len(request.components)} components of types {component_types} to {sf_session.instance_url}...")
-                print(f"Component names: {component_names}")
-                
-                # simple-salesforce deploy method expects a file path and sandbox flag
-                deploy_result_async_id = sf.deploy(temp_zip_file_path, sandbox=False)
-                
-                deployment_id = deploy_result_async_id.get('asyncId') or deploy_result_async_id.get('id')
-                if not deployment_id:
-                    return DeploymentResponse(
-                        request_id=request.request_id,
-                        success=False,
-                        status="Failed",
-                        error_message="Failed to initiate deployment: No deployment ID received.",
-                        total_components=len(request.components),
-                        successful_components=0,
-                        failed_components=len(request.components)
-                    )
-
-                print(f"Deployment initiated with ID: {deployment_id}. Polling for status...")
-
-                # Polling for deployment status
-                max_retries = 60  # Poll for up to 5 minutes (60 retries * 5 seconds)
-                retries = 0
-                final_status_info = None
-
-                while retries < max_retries:
-                    status_info = sf.checkDeployStatus(deployment_id)
-                    print(f"  Raw status_info: {status_info}")
-                    
-                    # The actual response structure uses 'state' not 'status'
-                    state = status_info.get('state', '')
-                    print(f"  State: {state}")
+            for _ in range(DEPLOY_POLL_MAX_ATTEMPTS):
+                final_status_info = self._final_status(sf.checkDeployStatus(deployment_id))
+                if final_status_info:
+                    return self._build_deployment_response(request, deployment_id, final_status_info)
+                time.sleep(DEPLOY_POLL_INTERVAL_SECONDS)
+
+            return self._timeout_response(request, deployment_id)
 
-                    # Check if deployment is complete (success or failure)
-                    if state in ['Succeeded', 'Failed', 'Canceled', 'SucceededPartial']:
-                        final_status_info = status_info
-                        break
-                    
-                    time.sleep(5)  # Wait 5 seconds before polling again
-                    retries += 1
-                
-                if not final_status_info:
-                    return DeploymentResponse(
-                        request_id=request.request_id,
-                        success=False,
-                        status="InProgress", # Or "TimedOut"
-                        deployment_id=deployment_id,
-                        error_message=f"Deployment polling timed out after {max_retries * 5} seconds.",
-                        total_components=len(request.components),
-                        successful_components=0,
-                        failed_components=len(request.components)
-                    )
-
-                # Process final deployment status
-                state = final_status_info.get('state', 'Unknown')
-                deployment_detail = final_status_info.get('deployment_detail', {})
-                
-                # Extract component errors from deployment_detail
-                deployment_errors = deployment_detail.get('errors', [])
-                
-                # Convert deployment errors to component errors format
-                component_errors = []
-                for error in deployment_errors:
-                    # Try to map error to specific component
-                    error_file = error.get('file', '')
-                    component_name = error.get('fullName', 'Unknown')
-                    component_type = error.get('type', 'Unknown')
-                    
-                    # If we can't get component info from error, try to infer from file path
-                    if component_name == 'Unknown' and error_file:
-                        for comp in request.components:
-                            config = self._get_component_config(comp)
-                            expected_path = f"{config['directory']}/{comp.api_name}.{config['file_extension']}"
-                            if expected_path in error_file:
-                                component_name = comp.api_name
-                                component_type = comp.component_type
-                                break
-                    
-                    component_errors.append({
-                        'fullName': component_name,
-                        'componentType': component_type,
-                        'problem': error.get('message', 'Unknown error'),
-                        'fileName': error_file
-                    })
-
-                # Extract component successes if available
-                component_successes = []
-                deployment_successes = deployment_detail.get('successes', [])
-                for success in deployment_successes:
-                    component_successes.append({
-                        'fullName': success.get('fullName', 'Unknown'),
-                        'componentType': success.get('type', 'Unknown'),
-                        'fileName': success.get('file', '')
-                    })
-
-                # Determine success based on state
-                success = state == 'Succeeded'
-                
-                # Calculate summary statistics
-                total_components = len(request.components)
-                failed_components = len(component_errors)
-                successful_components = total_components - failed_components
-                
-                # Extract error message
-                error_message = None
-                if not success and component_errors:
-                    error_message = f"Deployment failed with {len(component_errors)} error(s) out of {total_components} component(s)"
-                elif state == 'SucceededPartial':
-                    error_message = f"Deployment partially succeeded: {successful_components} succeeded, {failed_components} failed"
-
-                return DeploymentResponse(
-                    request_id=request.request_id,
-                    success=success,
-                    status=state,
-                    deployment_id=deployment_id,
-                    error_message=error_message,
-                    component_successes=component_successes,
-                    component_errors=component_errors,
-                    total_components=total_components,
-                    successful_components=successful_components,
-                    failed_components=failed_components
-                )
-            
-            finally:
-                # Clean up the temporary file
-                try:
-                    os.unlink(temp_zip_file_path)
-                except OSError:
-                    pass  # Ignore errors if file doesn't exist or can't be deleted
-
-        except SalesforceError as sde:
-            # This exception is raised by simple_salesforce on certain deploy errors
-            return DeploymentResponse(
-                request_id=request.request_id,
-                success=False,
-                status="Failed",
-                error_message=f"Salesforce deployment API error: {str(sde)}",
-                total_components=len(request.components) if request.components else 0,
-                successful_components=0,
-                failed_components=len(request.components) if request.components else 0
-            )
         except Exception as e:
-            # Catch any other unexpected errors during the process
-            return DeploymentResponse(
-                request_id=request.request_id,
-                success=False,
-                status="Failed",
-                error_message=f"An unexpected error occurred in SalesforceDeployerTool: {str(e)}",
-                total_components=len(request.components) if request.components else 0,
-                successful_components=0,
-                failed_components=len(request.components) if request.components else 0
-            )
+            return self._exception_response(request, e)
 
     async def _arun(self, request: DeploymentRequest) -> DeploymentResponse:
-        print("Warning: SalesforceDeployerTool._arun called; running synchronous version.")
-        return self._run(request)
+        """
+        Async variant of ``_run``. The blocking simple-salesforce calls run in a
+        worker thread, but the waits between status polls are ``asyncio.sleep``
+        so a deployment in progress does not pin a thread for minutes.
+        """
+        try:
+            sf = self._connect(request)
+            deployment_id = await asyncio.to_thread(self._submit_deployment, sf, request)
+            if not deployment_id:
+                return self._no_deployment_id_response(request)
+
+            print(f"Deployment initiated with ID: {deployment_id}. Polling for status...")
+
+            for _ in range(DEPLOY_POLL_MAX_ATTEMPTS):
+                status_info = await asyncio.to_thread(sf.checkDeployStatus, deployment_id)
+                final_status_info = self._final_status(status_info)
+                if final_status_info:
+                    return self._build_deployment_response(request, deployment_id, final_status_info)
+                await asyncio.sleep(DEPLOY_POLL_INTERVAL_SECONDS)
+
+            return self._timeout_response(request, deployment_id)
+
+        except Exception as e:
+            return self._exception_response(request, e)
 
 # Example Usage (for testing, typically not part of the tool file)
 if __name__ == '__main__':
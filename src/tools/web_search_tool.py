@@ -1,6 +1,10 @@
+import asyncio
+import functools
 import os
+import threading
 import time
-from typing import Dict, Any, Optional, List
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List, Tuple
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -23,6 +27,58 @@ from src.schemas.web_search_schemas import (
 dotenv_path = Path(__file__).resolve().parent.parent.parent / ".env"
 load_dotenv(dotenv_path=dotenv_path)
 
+# Bounded TTL cache of successful searches, shared by every WebSearchTool instance.
+# Retries and follow-up queries frequently repeat an identical Tavily request.
+SEARCH_CACHE_MAX_SIZE = 256
+SEARCH_CACHE_TTL_SECONDS = 600
+
+_search_cache: "OrderedDict[tuple, Tuple[float, WebSearchResponse]]" = OrderedDict()
+_search_cache_lock = threading.Lock()
+
+def _search_cache_key(request: WebSearchRequest) -> tuple:
+    """Normalize a search request into a hashable cache key."""
+    return (
+        request.query.strip().lower(),
+        request.max_results,
+        request.search_depth.value,
+        tuple(sorted(request.include_domains or ())),
+        tuple(sorted(request.exclude_domains or ())),
+        request.include_answer,
+        request.include_raw_content,
+        request.topic
+    )
+
+def _get_cached_search(key: tuple) -> Optional[WebSearchResponse]:
+    """Return a cached response if present and not expired."""
+    with _search_cache_lock:
+        entry = _search_cache.get(key)
+        if entry is None:
+            return None
+        stored_at, response = entry
+        if time.monotonic() - stored_at > SEARCH_CACHE_TTL_SECONDS:
+            del _search_cache[key]
+            return None
+        _search_cache.move_to_end(key)
+        return response
+
+def _store_cached_search(key: tuple, response: WebSearchResponse) -> None:
+    """Cache a response, evicting the least recently used entry when full."""
+    with _search_cache_lock:
+        _search_cache[key] = (time.monotonic(), response)
+        _search_cache.move_to_end(key)
+        while len(_search_cache) > SEARCH_CACHE_MAX_SIZE:
+            _search_cache.popitem(last=False)
+
+def clear_search_cache() -> None:
+    """Drop all cached search responses."""
+    with _search_cache_lock:
+        _search_cache.clear()
+
+@functools.lru_cache(maxsize=4)
+def _tavily_client(api_key: str) -> TavilyClient:
+    """Reuse one Tavily client per API key instead of building one per search."""
+    return TavilyClient(api_key=api_key)
+
 class WebSearchToolInput(BaseModel):
     """Input schema for the web search tool."""
     query: str = Field(description="The search query to execute")
@@ -56,7 +112,7 @@ class WebSearchTool(BaseTool):
         api_key = os.getenv("TAVILY_API_KEY")
         if not api_key:
             raise ValueError("TAVILY_API_KEY not found in environment variables")
-        return TavilyClient(api_key=api_key)
+        return _tavily_client(api_key)
     
     def _run(self, **kwargs) -> WebSearchResponse:
         """Execute the web search using Tavily."""
@@ -87,7 +143,29 @@ class WebSearchTool(BaseTool):
                 error_message=f"Web search tool error: {str(e)}"
             )
     
+    async def _arun(self, **kwargs) -> WebSearchResponse:
+        """Async version - run the blocking Tavily call in a worker thread."""
+        return await asyncio.to_thread(self._run, **kwargs)
+    
     def _perform_search(self, request: WebSearchRequest) -> WebSearchResponse:
+        """Perform the search, serving repeated requests from the cache."""
+        start_time = time.time()
+        cache_key = _search_cache_key(request)
+        cached_response = _get_cached_search(cache_key)
+        if cached_response is not None:
+            # Hand out a copy so callers cannot mutate the shared cached entry
+            response = cached_response.model_copy(deep=True)
+            response.metadata = {**(response.metadata or {}), "cached": True}
+            response.search_time_ms = (time.time() - start_time) * 1000
+            return response
+        
+        response = self._search_tavily(request)
+        # Only cache successes so transient failures are retried
+        if response.success:
+            _store_cached_search(cache_key, response)
+        return response
+    
+    def _search_tavily(self, request: WebSearchRequest) -> WebSearchResponse:
         """Perform the actual search using Tavily client."""
         start_time = time.time()
         